@@ -1,27 +1,12 @@
 import os
 import pandas as pd
-import re
-import requests
-import json
 import time
 import logging
 from urllib.parse import urlparse
-from newspaper import Config, Article
-from datetime import datetime
+from newspaper import Config
 from concurrent.futures import ThreadPoolExecutor, as_completed
-import functools
-import hashlib
-import pickle
+import sys
 
-# Logging configuration
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('url_to_content.log'),
-        logging.StreamHandler()
-    ]
-)
 logger = logging.getLogger(__name__)
 
 # Configuration
@@ -29,322 +14,379 @@ USER_AGENT = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10.15; rv:78.0) Gecko/20100
 config = Config()
 config.browser_user_agent = USER_AGENT
 config.request_timeout = 10
-MAX_RETRIES = 3
-RETRY_DELAY = 2
 MAX_WORKERS = 10  # Number of concurrent threads
+MAX_IN_FLIGHT = 100  # Concurrent article downloads across all publishers
+PER_DOMAIN = 4  # Concurrent article downloads per publisher
+PARSE_WORKERS = os.cpu_count()  # newspaper3k parse processes
+PARSE_QUEUE_SIZE = 200  # Downloaded pages waiting for a parse process
+RETRY_FAILED = False  # Retry URLs that failed before, even before their retry time
+REVALIDATE = False  # Re-check cached articles with conditional requests (ETag/Last-Modified)
+FALLBACK_PROVIDER = 'scrappey'  # Remote renderer for pages the direct download cannot get ('local' for tests)
+FALLBACK_BUDGET = 500  # Fallback renders allowed per run
+REPROCESS = False  # Also rewrite contents partitions already newer than their search results
 
-# Current directory and dataset path
+# Current directory and dataset stores
 current_dir = os.path.dirname(os.path.abspath(__file__))
-datasets_file_path = os.path.join(current_dir, '../dataset/')
+sys.path.append(current_dir)
+from Collection_Engine.dataset_store import PARTITION_KEYS, file_name as partition_file_name, get_store
+from Collection_Engine.content_cache import SingleFlight, get_content_cache, normalize_url
+from Collection_Engine.article_fetcher import ArticleFetcher
+from Collection_Engine.article_parser import clean_text, parse_html
+from Collection_Engine.article_pipeline import ArticlePipeline
+from Collection_Engine.msn_client import MsnClient, api_url as msn_api_url, parse_msn_url
+from Collection_Engine.content_writer import StreamingContentWriter
+from Collection_Engine.fallback_scraper import (DIRECT, FALLBACK, PROVIDERS, SKIP, DomainRouter,
+                                                FallbackBudgetExhausted, FallbackTier, url_domain)
 
 # Cache management
-CACHE_FILE = os.path.join(current_dir, 'url_content_cache.pkl')
+CACHE_FILE = os.path.join(current_dir, 'url_content_cache.db')
+LEGACY_CACHE_FILE = os.path.join(current_dir, 'url_content_cache.pkl')
 
 def load_cache():
-    """Load URL cache file"""
-    if os.path.exists(CACHE_FILE):
+    """Open the URL content cache, importing the legacy pickle the first time"""
+    cache = get_content_cache(CACHE_FILE)
+    if cache.created and os.path.exists(LEGACY_CACHE_FILE):
         try:
-            with open(CACHE_FILE, 'rb') as f:
-                return pickle.load(f)
+            logger.info(f"Imported {cache.import_pickle(LEGACY_CACHE_FILE)} entries from {LEGACY_CACHE_FILE}")
         except Exception as e:
-            logger.error(f"Cache loading error: {e}")
-    return {}
+            logger.error(f"Cache import error: {e}")
+    return cache
 
-def save_cache(cache):
-    """Save URL cache file"""
-    try:
-        with open(CACHE_FILE, 'wb') as f:
-            pickle.dump(cache, f)
-    except Exception as e:
-        logger.error(f"Cache saving error: {e}")
-
-# Load URL content cache
-url_cache = load_cache()
-
-def get_datetime_folders():
-    """Get list of date folders from dataset directory"""
-    if not os.path.exists(datasets_file_path):
-        logger.error(f"Dataset path does not exist: {datasets_file_path}")
-        return []
-    
-    folders = [folder for folder in os.listdir(datasets_file_path) 
-               if os.path.isdir(os.path.join(datasets_file_path, folder))]
-    return sorted(folders, reverse=True)
+# Stores, cache and clients are opened by open_resources() in main(): parse workers re-import this
+# module under the spawn start method and must not open their own connections
+search_store = None  # Written by the collector
+contents_store = None  # Search results plus Article_Content
+url_cache = None  # URL content cache, written per entry
+msn_client = None  # Pooled session for the MSN content API
+fallback_tier = None  # Budgeted fallback renderer
+router = None  # Per-domain routing learned from earlier outcomes
+# Concurrent requests for the same normalized URL share one fetch
+in_flight = SingleFlight()
 
-def retry_on_failure(max_retries=MAX_RETRIES, delay=RETRY_DELAY):
-    """Retry decorator"""
-    def decorator(func):
-        @functools.wraps(func)
-        def wrapper(*args, **kwargs):
-            last_exception = None
-            for attempt in range(max_retries):
-                try:
-                    return func(*args, **kwargs)
-                except Exception as e:
-                    last_exception = e
-                    if attempt < max_retries - 1:
-                        sleep_time = delay * (2 ** attempt)  # Exponential backoff
-                        logger.warning(f"Attempt {attempt+1}/{max_retries} failed: {e}. Retrying in {sleep_time} seconds...")
-                        time.sleep(sleep_time)
-            logger.error(f"All retry attempts failed: {last_exception}")
-            return None
-        return wrapper
-    return decorator
+def open_resources():
+    """Open the dataset stores, the URL content cache and the API clients for this run"""
+    global search_store, contents_store, url_cache, msn_client, fallback_tier, router
+    search_store = get_store('search_results')
+    contents_store = get_store('contents')
+    url_cache = load_cache()
+    msn_client = MsnClient()
+    fallback_tier = FallbackTier(PROVIDERS[FALLBACK_PROVIDER](), FALLBACK_BUDGET)
+    router = DomainRouter(url_cache)
 
-def clean_text(text):
-    """Clean text: remove newlines and quotes"""
-    if not text:
-        return None
-    text = re.sub(r'[\n"\'""'']', ' ', text)
-    # Replace multiple spaces with a single space
-    text = re.sub(r'\s+', ' ', text).strip()
-    return text if text else None
+def close_resources():
+    if msn_client is not None:
+        msn_client.close()
+    if url_cache is not None:
+        url_cache.close()
 
-@retry_on_failure()
-def process_msn(url):
-    """Process MSN news URL"""
-    logger.info(f"Starting MSN processing: {url}")
-    match = re.search(r'/ar-([^?]+)', url)
-    if not match:
-        logger.error(f"Could not extract ID from URL: {url}")
-        return None
-    
-    extracted_part = match.group(1)
-    msn_url = f"https://assets.msn.com/content/view/v2/Detail/en-us/{extracted_part}"
-    
-    response = requests.get(msn_url)
-    if response.status_code != 200:
-        logger.error(f"MSN API request failed ({response.status_code}): {url}")
-        return None
-    
+def process_fallback(url):
+    """Process URL through the fallback renderer: one attempt, counted against the run's budget"""
+    logger.info(f"Attempting with {fallback_tier.provider.name}: {url}")
     try:
-        data = json.loads(response.text)
-        if 'body' not in data:
-            logger.error(f"No 'body' key in JSON response: {url}")
-            return None
-        
-        article = Article(url="")
-        article.download(input_html=data['body'])
-        article.parse()
-        text = clean_text(article.text)
-        
-        if text:
-            logger.info(f"MSN processing completed: {url}")
-            return text
-        logger.warning(f"No text extracted: {url}")
-        return None
-    except Exception as e:
-        logger.error(f"MSN processing error: {url}, {e}")
+        text = parse_html(fallback_tier.render(url), url)
+    except FallbackBudgetExhausted:
         raise
+    except Exception:
+        router.record(url, FALLBACK, False)
+        raise
+    router.record(url, FALLBACK, bool(text))
+    if text:
+        logger.info(f"Fallback processing completed: {url}")
+        return text
+    logger.warning(f"Text extraction failed with the fallback too: {url}")
+    raise ValueError("Text extraction failed with the fallback too")
 
-@retry_on_failure()
-def process_other(url):
-    """Process regular URL"""
-    logger.info(f"Starting regular URL processing: {url}")
-    try:
-        article = Article(url, config=config)
-        article.download()
-        article.parse()
-        text = clean_text(article.text)
-        if text:
-            logger.info(f"Regular URL processing completed: {url}")
-            return text
-        raise ValueError("Text extraction failed")
-    except Exception as e:
-        logger.warning(f"newspaper3k failed: {url}, {e}")
-        
-        # Retry with Scrappey API
-        logger.info(f"Attempting with Scrappey: {url}")
-        api_url = 'https://publisher.scrappey.com/api/v1?key=[your_api_key]'
-        headers = {'Content-Type': 'application/json'}
-        data = {
-            'cmd': 'request.get',
-            'url': url,
-        }
-        response = requests.post(api_url, headers=headers, json=data)
-        
-        if response.status_code != 200:
-            logger.error(f"Scrappey API response error ({response.status_code}): {url}")
-            raise ValueError(f"Scrappey API response error: {response.status_code}")
-        
-        response_json = response.json()
-        html_content = response_json.get('solution', {}).get('response', '')
-        
-        if not html_content:
-            logger.error(f"No HTML received from Scrappey: {url}")
-            raise ValueError("Empty HTML returned from Scrappey")
-        
-        article = Article(url="")
-        article.download(input_html=html_content)
-        article.parse()
-        text = clean_text(article.text)
-        
-        if text:
-            logger.info(f"Scrappey processing completed: {url}")
-            return text
-        logger.warning(f"Text extraction failed with Scrappey too: {url}")
-        raise ValueError("Text extraction failed with Scrappey too")
-
-def get_url_content(url):
-    """Extract content from URL (using cache)"""
+def get_url_content(url, process):
+    """Extract content from URL with `process` (using cache)"""
     if pd.isna(url) or not url:
         return None
     
+    return in_flight.do(normalize_url(url), fetch_url_content, url, process)
+
+def fetch_url_content(url, process):
+    """Extract content from URL once no other thread is fetching it"""
     # Check cache
-    if url in url_cache:
+    cached = url_cache.get(url)
+    if cached is not None:
         logger.debug(f"Using content from cache: {url}")
-        return url_cache[url]
+        return cached
+    
+    # Skip URLs that failed recently
+    failure = url_cache.failure(url)
+    if failure:
+        logger.debug(f"Skipping failed URL ({failure['attempts']} attempts, {failure['reason']}): {url}")
+        return None
     
-    # Process based on URL type
+    # Extract with the given tier
     try:
-        parsed_url = urlparse(url)
-        domain = parsed_url.netloc
-        
-        if 'msn.com' in domain:
-            content = process_msn(url)
-        else:
-            content = process_other(url)
+        content = process(url)
         
         # Save to cache
         if content:
-            url_cache[url] = content
-            # Periodically save cache (based on hash value)
-            if hash(url) % 10 == 0:  # Save after ~10% of URLs processed
-                save_cache(url_cache)
+            url_cache.put(url, content)
+        else:
+            url_cache.record_failure(url, "No content extracted")
         
         return content
+    except FallbackBudgetExhausted:
+        # Not the URL's fault: the caller leaves it for the next run
+        raise
     except Exception as e:
         logger.error(f"Content extraction failed: {url}, {e}")
+        url_cache.record_failure(url, f"{type(e).__name__}: {e}")
         return None
 
-def process_csv(path, file_name):
-    """Process CSV file"""
-    full_path = os.path.join(path, file_name)
-    logger.info(f"Starting CSV processing: {full_path}")
+def plan_urls(partitions):
+    """Unique URLs of all partitions, one per normalized URL, and each partition's set of normalized URLs"""
+    urls = {}
+    partition_urls = []
+    for partition in partitions:
+        keys = set()
+        partition_urls.append(keys)
+        try:
+            df = search_store.read_partition(columns=['url'], **partition)
+        except Exception as e:
+            logger.warning(f"Could not read URLs of {partition}: {e}")
+            continue
+        for url in df['url'].dropna():
+            if url:
+                key = normalize_url(url)
+                urls.setdefault(key, url)
+                keys.add(key)
+    return list(urls.values()), partition_urls
+
+def download_and_parse(urls, url_to_content):
+    """Download non-MSN article pages and parse them in worker processes; returns the URLs that need the fallback"""
+    fallback_urls = []
+    direct_urls = []
+    for url in urls:
+        route = router.route(url)
+        if route == SKIP:
+            # Nothing was attempted, so no failure is recorded: the URL is retried once the domain's routing expires
+            url_to_content[normalize_url(url)] = url_cache.get(url)
+        elif route == FALLBACK:
+            fallback_urls.append(url)
+        else:
+            direct_urls.append(url)
+    logger.info(f"Routing: {len(direct_urls)} direct, {len(fallback_urls)} straight to the fallback, "
+                f"{len(urls) - len(direct_urls) - len(fallback_urls)} skipped")
+    urls = direct_urls
+    
+    validators = {}
+    if REVALIDATE:
+        validators = {url: url_cache.validators(url) for url in urls}
+        validators = {url: value for url, value in validators.items() if value}
+    
+    def on_parsed(result, text):
+        router.record(result.url, DIRECT, result.status == 304 or bool(text))
+        if result.status == 304:
+            url_to_content[normalize_url(result.url)] = url_cache.get(result.url)
+        elif text:
+            url_cache.put(result.url, text, result.etag, result.last_modified)
+            url_to_content[normalize_url(result.url)] = text
+        else:
+            if result.html is None:
+                logger.warning(f"Download failed: {result.url}, {result.error}")
+            fallback_urls.append(result.url)
+    
+    fetcher = ArticleFetcher(USER_AGENT, max_in_flight=MAX_IN_FLIGHT, per_domain=PER_DOMAIN,
+                             timeout=config.request_timeout)
+    pipeline = ArticlePipeline(fetcher, parse_workers=PARSE_WORKERS, queue_size=PARSE_QUEUE_SIZE)
+    pipeline.run(urls, validators, on_parsed)
+    for url, reason in pipeline.failed:
+        url_cache.record_failure(url, reason)
+        url_to_content[normalize_url(url)] = None
+    return fallback_urls
+
+def fetch_msn_articles(urls, url_to_content):
+    """MSN stage: one content API request per distinct (locale, article id), cached by id"""
+    pending = {}
+    for url in urls:
+        key = parse_msn_url(url)
+        if key is None:
+            logger.error(f"Could not extract ID from URL: {url}")
+            url_cache.record_failure(url, "No MSN article id")
+            url_to_content[normalize_url(url)] = None
+            continue
+        cached = url_cache.get(msn_api_url(*key))
+        if cached is not None:
+            url_cache.put(url, cached)
+            url_to_content[normalize_url(url)] = cached
+        else:
+            pending.setdefault(key, []).append(url)
+    
+    logger.info(f"Fetching {len(pending)} MSN articles for {len(urls)} URLs")
+    for key, result in msn_client.fetch_many(pending).items():
+        text = None if isinstance(result, Exception) else clean_text(result)
+        if text:
+            url_cache.put(msn_api_url(*key), text)
+        else:
+            logger.warning(f"MSN processing failed: {key}, {result if isinstance(result, Exception) else 'no text'}")
+        for url in pending[key]:
+            if text:
+                url_cache.put(url, text)
+            else:
+                url_cache.record_failure(url, f"{type(result).__name__}: {result}" if isinstance(result, Exception) else "No content extracted")
+            url_to_content[normalize_url(url)] = text
+
+def fetch_contents(urls, url_to_content):
+    """Fetch every URL once, assigning url_to_content[normalized URL] as each one resolves"""
+    pending = []
+    for url in urls:
+        cached = url_cache.get(url)
+        if cached is not None and not REVALIDATE:
+            url_to_content[normalize_url(url)] = cached
+        elif cached is None and url_cache.failure(url):
+            url_to_content[normalize_url(url)] = None
+        else:
+            pending.append(url)
+    
+    msn_urls = [url for url in pending if 'msn.com' in urlparse(url).netloc]
+    other_urls = [url for url in pending if 'msn.com' not in urlparse(url).netloc]
+    logger.info(f"{len(urls) - len(pending)} URLs cached or failed recently, downloading {len(other_urls)}")
+    
+    fetch_msn_articles(msn_urls, url_to_content)
+    fallback_urls = download_and_parse(other_urls, url_to_content)
+    logger.info(f"{len(fallback_urls)} URLs go to the fallback, budget left: {fallback_tier.remaining()}")
+    
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        # Failed downloads and fallback-routed domains go through the fallback renderer
+        future_to_url = {executor.submit(get_url_content, url, process_fallback): url for url in fallback_urls}
+        
+        for future in as_completed(future_to_url):
+            url = future_to_url[future]
+            try:
+                url_to_content[normalize_url(url)] = future.result()
+            except FallbackBudgetExhausted as e:
+                logger.warning(f"Content extraction deferred: {url}, {e}")
+                url_to_content.defer(normalize_url(url))
+            except Exception as e:
+                logger.error(f"Error processing URL: {url}, {e}")
+                url_to_content[normalize_url(url)] = None
+
+def process_partition(partition, url_to_content, missing=None):
+    """Add Article_Content to one search result partition and store it in the contents dataset"""
+    name = f"{partition['created_date']}/{partition['engine']}/{partition['context']}/{partition_file_name(partition['topic'], partition['variant'])}"
     
     try:
-        df = pd.read_csv(full_path)
+        df = search_store.read_partition(**partition)
         
         if 'url' not in df.columns:
-            logger.warning(f"No 'url' column found: {full_path}")
+            logger.warning(f"No 'url' column found: {name}")
             return
         
-        # Filter rows without URLs
-        df_with_urls = df[~df['url'].isna() & (df['url'] != '')].copy()
-        df_without_urls = df[df['url'].isna() | (df['url'] == '')].copy()
-        
-        if df_with_urls.empty:
-            logger.warning(f"No URLs to process: {full_path}")
-            return
-        
-        # Parallel processing
-        urls = df_with_urls['url'].tolist()
-        logger.info(f"Starting processing of {len(urls)} URLs: {file_name}")
-        
-        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-            # Submit URLs and map results
-            future_to_url = {executor.submit(get_url_content, url): url for url in urls}
-            
-            # Dictionary to track results
-            url_to_content = {}
-            
-            for future in as_completed(future_to_url):
-                url = future_to_url[future]
-                try:
-                    content = future.result()
-                    url_to_content[url] = content
-                except Exception as e:
-                    logger.error(f"Error processing URL: {url}, {e}")
-                    url_to_content[url] = None
-        
-        # Apply results to dataframe
-        df_with_urls['Article_Content'] = df_with_urls['url'].map(url_to_content)
-        
-        # Add None for rows without URLs
-        if not df_without_urls.empty:
-            df_without_urls['Article_Content'] = None
-            
-        # Merge dataframes
-        df_result = pd.concat([df_with_urls, df_without_urls])
+        # Apply results to dataframe, keeping the search result order; rows without URLs get no content
+        df['Article_Content'] = [url_to_content.get(normalize_url(url)) if isinstance(url, str) and url else None
+                                 for url in df['url']]
         
         # Save results
-        new_path = path.replace('sigir_datasets', 'sigir_results')
-        os.makedirs(new_path, exist_ok=True)
-        
-        new_file_path = os.path.join(new_path, file_name)
-        df_result.to_csv(new_file_path, index=False)
-        logger.info(f"CSV processing completed: {full_path} -> {new_file_path}")
+        new_file_path = contents_store.write(df, missing=missing, **partition)
+        logger.info(f"Partition processing completed: {name} -> {new_file_path}")
         
     except Exception as e:
-        logger.error(f"CSV processing error: {full_path}, {e}")
+        logger.error(f"Partition processing error: {name}, {e}")
+
+def count_missing(partition):
+    """Distinct URLs of a written contents partition without Article_Content, recorded in the catalog"""
+    try:
+        df = contents_store.read_partition(columns=['url', 'Article_Content'], **partition)
+    except Exception as e:
+        logger.warning(f"Could not read contents of {partition}: {e}")
+        return None
+    missing = len({normalize_url(url) for url, content in zip(df['url'], df['Article_Content'])
+                   if isinstance(url, str) and url and pd.isna(content)})
+    contents_store.set_missing(missing=missing, **partition)
+    return missing
 
-def process_directory(datetime_range, pir_range, pf_range):
-    """Traverse directories and process files"""
-    start_date = datetime.strptime(datetime_range[0], "%Y-%m-%d")
-    end_date = datetime.strptime(datetime_range[1], "%Y-%m-%d")
-    datetime_folders = get_datetime_folders()
+def unfinished_partitions(datetime_range, pir_range, pf_range):
+    """
+    Search result partitions in range whose contents partition is missing or older than them, or
+    references URLs that are neither cached nor failed recently (never fetched, or due for a retry)
+    on a domain that is not currently skipped
+    """
+    filters = dict(date_range=datetime_range, exclude={'engine': pir_range, 'context': pf_range})
+    entries = search_store.entries(**filters)
+    finished = {} if REPROCESS else {entry['path']: entry for entry in contents_store.entries(**filters)}
+    partitions = []
+    written = []
+    for entry in entries:
+        partition = {key: entry[key] for key in PARTITION_KEYS}
+        done = finished.get(entry['path'])
+        if done is None or done['mtime'] < entry['mtime']:
+            partitions.append(partition)
+        elif done['missing'] is None:
+            # Written before the catalog kept the count: count once from the file
+            if count_missing(partition) != 0:
+                written.append(partition)
+        elif done['missing']:
+            written.append(partition)
     
-    for datetime_folder in datetime_folders:
-        try:
-            folder_date = datetime.strptime(datetime_folder, "%Y-%m-%d")
-            if folder_date < start_date or folder_date > end_date:
-                logger.info(f"Skipping folder outside date range: {datetime_folder}")
-                continue
-            
-            folder_path = os.path.join(datasets_file_path, datetime_folder)
-            if not os.path.isdir(folder_path):
-                continue
-                
-            pir_folders = [folder for folder in os.listdir(folder_path) 
-                          if os.path.isdir(os.path.join(folder_path, folder))]
-                
-            for pir_folder in pir_folders:
-                if pir_folder in pir_range:
-                    logger.info(f"Skipping PIR folder as configured: {pir_folder}")
-                    continue
-                    
-                pir_folder_path = os.path.join(folder_path, pir_folder)
-                pf_folders = [folder for folder in os.listdir(pir_folder_path) 
-                             if os.path.isdir(os.path.join(pir_folder_path, folder))]
-                    
-                for pf_folder in pf_folders:
-                    if pf_folder in pf_range:
-                        logger.info(f"Skipping PF folder as configured: {pf_folder}")
-                        continue
-                        
-                    pf_folder_path = os.path.join(pir_folder_path, pf_folder)
-                    csv_files = [file for file in os.listdir(pf_folder_path) if file.endswith('.csv')]
-                    
-                    with ThreadPoolExecutor(max_workers=5) as executor:
-                        # Process multiple CSV files in parallel
-                        csv_path = os.path.join(folder_path, pir_folder, pf_folder)
-                        executor.map(lambda file: process_csv(csv_path, file), csv_files)
-                        
-        except Exception as e:
-            logger.error(f"Directory processing error: {datetime_folder}, {e}")
+    # Written partitions with URLs left without content come back once one of them reaches its retry time
+    retry = []
+    if written:
+        _, written_urls = plan_urls(written)
+        # URLs on skipped domains wait for the domain's routing to expire rather than rewriting the partition each run
+        routes = {}
+        unresolved = set()
+        for url in url_cache.unresolved(set().union(*written_urls)):
+            domain = url_domain(url)
+            if domain not in routes:
+                routes[domain] = router.route(url)
+            if routes[domain] != SKIP:
+                unresolved.add(url)
+        retry = [partition for partition, urls in zip(written, written_urls) if urls & unresolved]
+        partitions.extend(retry)
+    logger.info(f"Found {len(entries)} partitions, {len(entries) - len(partitions)} already finished, "
+                f"{len(retry)} written with URLs due for a retry")
+    return partitions
+
+def process_store(datetime_range, pir_range, pf_range):
+    """Fetch the unique URLs of every unfinished search result partition, writing each back once its URLs resolve"""
+    partitions = unfinished_partitions(datetime_range, pir_range, pf_range)
+    
+    # Plan: each URL is fetched once however many partitions reference it
+    urls, partition_urls = plan_urls(partitions)
+    logger.info(f"Starting processing of {len(urls)} unique URLs")
+    
+    # Join contents into each partition as soon as all of its URLs are resolved
+    # Partitions with unresolved URLs, including all of them when the run fails, stay unfinished for the next run
+    writer = StreamingContentWriter(partitions, partition_urls, process_partition)
+    try:
+        fetch_contents(urls, writer)
+    finally:
+        logger.info(f"Wrote {writer.close()} partitions")
 
 def main():
     """Main function"""
+    # Logging configuration
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler('url_to_content.log'),
+            logging.StreamHandler()
+        ]
+    )
     start_time = time.time()
     logger.info("Starting URL content extraction")
     
     datetime_range = ['2023-09-24', '2024-08-04']
-    pir_range = ['google_news']  # PIR folders to skip
-    pf_range = []  # PF folders to skip
+    pir_range = ['google_news']  # Engines to skip
+    pf_range = []  # Contexts to skip
     
     try:
-        process_directory(datetime_range, pir_range, pf_range)
+        open_resources()
+        if RETRY_FAILED:
+            url_cache.clear_failures()
         
-        # Save cache after completion
-        save_cache(url_cache)
+        process_store(datetime_range, pir_range, pf_range)
         
         elapsed_time = time.time() - start_time
         logger.info(f"Task completed! Total time: {elapsed_time:.2f} seconds")
     except Exception as e:
         logger.error(f"Error during processing: {e}")
     finally:
-        # Save cache on exit
-        save_cache(url_cache)
+        close_resources()
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
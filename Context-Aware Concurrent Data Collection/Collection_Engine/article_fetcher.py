@@ -0,0 +1,137 @@
+"""
+Asynchronous article downloader for url_to_content.
+
+Downloads run on one event loop under a global in-flight budget and a semaphore per publisher
+domain, over a shared connection pool (HTTP/2 when httpx and h2 are installed). Cached
+articles can be revalidated with If-None-Match / If-Modified-Since, so unchanged pages come
+back as 304 without a body. Parsing is left to the caller (see article_pipeline.py).
+"""
+import asyncio
+import logging
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+MAX_IN_FLIGHT = 100  # Concurrent downloads across all publishers
+PER_DOMAIN = 4  # Concurrent downloads per publisher domain
+TIMEOUT = 10
+
+FetchResult = namedtuple('FetchResult', 'url status html etag last_modified error')
+
+
+class HttpxTransport:
+    """Native async transport: one httpx client with a shared (HTTP/2 when available) connection pool"""
+    def __init__(self, user_agent, timeout=TIMEOUT, max_connections=MAX_IN_FLIGHT):
+        import httpx
+        try:
+            import h2  # noqa: F401
+            http2 = True
+        except ImportError:
+            http2 = False
+        self.client = httpx.AsyncClient(http2=http2, follow_redirects=True, timeout=timeout,
+                                        headers={'User-Agent': user_agent},
+                                        limits=httpx.Limits(max_connections=max_connections,
+                                                            max_keepalive_connections=max_connections))
+
+    async def get(self, url, headers):
+        response = await self.client.get(url, headers=headers)
+        return response.status_code, response.headers, response.text
+
+    async def close(self):
+        await self.client.aclose()
+
+
+class RequestsTransport:
+    """Fallback transport: a pooled requests session driven from a private thread pool"""
+    def __init__(self, user_agent, timeout=TIMEOUT, max_connections=MAX_IN_FLIGHT):
+        import requests
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers['User-Agent'] = user_agent
+        adapter = requests.adapters.HTTPAdapter(pool_connections=max_connections, pool_maxsize=max_connections)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.executor = ThreadPoolExecutor(max_workers=max_connections, thread_name_prefix='article-fetch')
+
+    def get_blocking(self, url, headers):
+        response = self.session.get(url, headers=headers, timeout=self.timeout)
+        return response.status_code, response.headers, response.text
+
+    async def get(self, url, headers):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self.get_blocking, url, headers)
+
+    async def close(self):
+        self.executor.shutdown(wait=False)
+        self.session.close()
+
+
+def default_transport(user_agent, timeout=TIMEOUT, max_connections=MAX_IN_FLIGHT):
+    try:
+        return HttpxTransport(user_agent, timeout, max_connections)
+    except ImportError:
+        logging.info("httpx not installed, falling back to threaded requests transport")
+        return RequestsTransport(user_agent, timeout, max_connections)
+
+
+class ArticleFetcher:
+    def __init__(self, user_agent, transport=None, max_in_flight=MAX_IN_FLIGHT, per_domain=PER_DOMAIN,
+                 timeout=TIMEOUT):
+        self.user_agent = user_agent
+        self.transport = transport
+        self.max_in_flight = max_in_flight
+        self.per_domain = per_domain
+        self.timeout = timeout
+
+    async def fetch(self, url, validators=None):
+        """Download one URL; errors and HTTP failures are returned in the result, never raised"""
+        headers = {}
+        if validators:
+            etag, last_modified = validators
+            if etag:
+                headers['If-None-Match'] = etag
+            if last_modified:
+                headers['If-Modified-Since'] = last_modified
+
+        try:
+            status, response_headers, html = await self.transport.get(url, headers)
+        except Exception as e:
+            return FetchResult(url, None, None, None, None, f"{type(e).__name__}: {e}")
+        if status == 304:
+            return FetchResult(url, status, None, *(validators or (None, None)), None)
+        if status >= 400:
+            return FetchResult(url, status, None, None, None, f"HTTP {status}")
+        return FetchResult(url, status, html, response_headers.get('etag'), response_headers.get('last-modified'), None)
+
+    async def fetch_many(self, urls, validators=None, on_result=None):
+        """
+        FetchResults in `urls` order; `validators` maps a URL to its cached (etag, last_modified).
+        With `on_result` (a coroutine function) each result is handed over as it completes instead of
+        being returned. The domain and budget slots are held until the hand-off finishes, so a slow
+        consumer pauses downloads rather than piling up pages in memory
+        """
+        if self.transport is None:
+            self.transport = default_transport(self.user_agent, self.timeout, self.max_in_flight)
+        budget = asyncio.Semaphore(self.max_in_flight)
+        domains = {}
+        validators = validators or {}
+
+        async def fetch_one(url):
+            domain = urlsplit(url).netloc.lower()
+            if domain not in domains:
+                domains[domain] = asyncio.Semaphore(self.per_domain)
+            # Waiting for a busy publisher does not take a slot from the global budget
+            async with domains[domain], budget:
+                result = await self.fetch(url, validators.get(url))
+                if on_result is None:
+                    return result
+                await on_result(result)
+
+        try:
+            return await asyncio.gather(*(fetch_one(url) for url in urls))
+        finally:
+            await self.transport.close()
+            self.transport = None
+
+    def fetch_all(self, urls, validators=None):
+        return asyncio.run(self.fetch_many(urls, validators))
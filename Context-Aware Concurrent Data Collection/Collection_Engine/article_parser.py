@@ -0,0 +1,38 @@
+"""
+Article text extraction with newspaper3k, importable by parse worker processes.
+
+Parsing only: pages are downloaded by the caller, and image fetching is switched off so
+Article.parse() never goes back to the network.
+"""
+import re
+
+from newspaper import Article, Config
+
+config = Config()
+config.fetch_images = False
+
+
+def clean_text(text):
+    """Clean text: remove newlines and quotes"""
+    if not text:
+        return None
+    text = re.sub(r'[\n"\'""'']', ' ', text)
+    # Replace multiple spaces with a single space
+    text = re.sub(r'\s+', ' ', text).strip()
+    return text if text else None
+
+
+def parse_html(html, url=''):
+    """Extract article text from HTML downloaded from `url`, which relative links and metadata resolve against"""
+    article = Article(url, config=config)
+    article.download(input_html=html)
+    article.parse()
+    return clean_text(article.text)
+
+
+def parse_or_none(html, url=''):
+    """parse_html for pool workers: a page newspaper3k cannot parse yields None instead of an error"""
+    try:
+        return parse_html(html, url)
+    except Exception:
+        return None
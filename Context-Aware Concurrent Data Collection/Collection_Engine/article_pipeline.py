@@ -0,0 +1,129 @@
+"""
+Two-stage article pipeline: I/O coroutines download pages into a bounded queue of raw HTML and a
+process pool of parse workers drains it, so newspaper3k's CPU-heavy parsing runs outside the GIL
+of the downloading process.
+
+Queue depth is sampled while the pipeline runs. A queue that stays full (downloads waiting on
+`put`) means parsing is the bottleneck; an empty one (parsers waiting on `get`) means downloads are.
+
+A page whose parse or callback raises is logged and collected in `failed` instead of aborting the
+run, and a pool broken by a crashed worker is replaced.
+"""
+import asyncio
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from Collection_Engine.article_parser import parse_or_none
+
+QUEUE_SIZE = 200  # Downloaded pages waiting for a parse worker
+METRICS_INTERVAL = 30  # Seconds between queue depth log lines
+
+
+class ArticlePipeline:
+    def __init__(self, fetcher, parse_workers=None, queue_size=QUEUE_SIZE, metrics_interval=METRICS_INTERVAL,
+                 parse=parse_or_none):
+        self.fetcher = fetcher
+        self.parse_workers = parse_workers or os.cpu_count()
+        self.queue_size = queue_size
+        self.metrics_interval = metrics_interval
+        self.parse = parse
+        self.metrics = {}
+        self.failed = []
+
+    async def run_async(self, urls, validators, on_parsed):
+        """
+        Download and parse `urls`, calling on_parsed(fetch result, text or None) for each on the event
+        loop. Pages that could not be handled are left in `failed` as (url, reason)
+        """
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        metrics = self.metrics = {'downloaded': 0, 'parsed': 0, 'failed': 0, 'pool_restarts': 0,
+                                  'put_wait': 0.0, 'get_wait': 0.0,
+                                  'depth_samples': 0, 'depth_total': 0, 'depth_max': 0}
+        self.failed = []
+        pool = {'executor': ProcessPoolExecutor(max_workers=self.parse_workers)}
+
+        async def put(result):
+            started = time.monotonic()
+            await queue.put(result)
+            metrics['put_wait'] += time.monotonic() - started
+            metrics['downloaded'] += 1
+
+        async def produce():
+            try:
+                await self.fetcher.fetch_many(urls, validators, on_result=put)
+            finally:
+                for _ in range(self.parse_workers):
+                    await queue.put(None)
+
+        async def parse(result):
+            executor = pool['executor']
+            try:
+                return await loop.run_in_executor(executor, self.parse, result.html, result.url)
+            except BrokenProcessPool:
+                # Every page in flight on the dead pool fails; the first consumer to notice replaces it
+                if pool['executor'] is executor:
+                    logging.warning("Parse worker died, restarting the parse pool")
+                    executor.shutdown(wait=False)
+                    pool['executor'] = ProcessPoolExecutor(max_workers=self.parse_workers)
+                    metrics['pool_restarts'] += 1
+                raise
+
+        async def handle(result):
+            text = None
+            if result.html is not None:
+                text = await parse(result)
+                metrics['parsed'] += 1
+            on_parsed(result, text)
+
+        async def consume():
+            while True:
+                started = time.monotonic()
+                result = await queue.get()
+                metrics['get_wait'] += time.monotonic() - started
+                if result is None:
+                    return
+                try:
+                    await handle(result)
+                except Exception as e:
+                    logging.error(f"Article pipeline failed on {result.url}: {type(e).__name__}: {e}")
+                    metrics['failed'] += 1
+                    self.failed.append((result.url, f"{type(e).__name__}: {e}"))
+
+        async def sample():
+            last_log = time.monotonic()
+            while True:
+                await asyncio.sleep(1)
+                depth = queue.qsize()
+                metrics['depth_samples'] += 1
+                metrics['depth_total'] += depth
+                metrics['depth_max'] = max(metrics['depth_max'], depth)
+                if time.monotonic() - last_log >= self.metrics_interval:
+                    last_log = time.monotonic()
+                    logging.info(f"Article pipeline: {metrics['downloaded']}/{len(urls)} downloaded, "
+                                 f"{metrics['parsed']} parsed, queue depth {depth}/{self.queue_size}")
+
+        sampler = asyncio.create_task(sample())
+        try:
+            await asyncio.gather(produce(), *(consume() for _ in range(self.parse_workers)))
+        finally:
+            sampler.cancel()
+            pool['executor'].shutdown()
+        self.log_summary()
+        return metrics
+
+    def run(self, urls, validators, on_parsed):
+        return asyncio.run(self.run_async(urls, validators, on_parsed))
+
+    def log_summary(self):
+        metrics = self.metrics
+        mean_depth = metrics['depth_total'] / metrics['depth_samples'] if metrics['depth_samples'] else 0.0
+        bottleneck = 'parsing' if metrics['put_wait'] > metrics['get_wait'] else 'downloading'
+        logging.info(f"Article pipeline done: {metrics['downloaded']} downloaded, {metrics['parsed']} parsed, "
+                     f"{metrics['failed']} failed, {metrics['pool_restarts']} parse pool restarts, "
+                     f"queue depth mean {mean_depth:.1f} max {metrics['depth_max']}/{self.queue_size}, "
+                     f"downloads waited {metrics['put_wait']:.1f}s on the queue, "
+                     f"parsers waited {metrics['get_wait']:.1f}s for pages; bottleneck: {bottleneck}")
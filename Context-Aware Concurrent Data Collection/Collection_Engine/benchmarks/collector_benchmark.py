@@ -0,0 +1,76 @@
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+from Serverless_Functions.local_lambda import use_local_lambda
+from Collection_Engine import collector, dataset_store
+from Collection_Engine.context_provider import get_provider
+from Collection_Engine.rate_scheduler import RatePolicy, RateScheduler
+from Collection_Engine.specs import CONTEXTS, ENGINES
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+
+# Stand-in for decrypted browser cookies, so the benchmark needs no Chrome profile
+OFFLINE_COOKIES = {'AEC': 'offline', 'NID': 'offline', 'DV': 'offline', 'SID': 'offline'}
+
+
+def run(args):
+    client = use_local_lambda(max_workers=args.workers, mode=args.mode, fixtures_dir=args.fixtures,
+                              latency=args.latency, latency_jitter=args.jitter,
+                              error_rate=args.error_rate, empty_rate=args.empty_rate, seed=0)
+    for engine in args.engines:
+        get_provider(os.path.join(collector.base_dir, engine)).cookie_loader = lambda cookie_file, domain_name: dict(OFFLINE_COOKIES)
+
+    policies = {
+        'page': RatePolicy(interval=args.page_interval, jitter=0),
+        'interaction': RatePolicy(interval=args.interaction_interval, jitter=0),
+    }
+    scheduler = RateScheduler(policies, max_workers=args.workers)
+    collector.DATASET_DIR = tempfile.mkdtemp(prefix='collector-benchmark-')
+    dataset_store.STORE_DIR = os.path.join(collector.DATASET_DIR, 'store')
+    # Fixture pages must not end up in the real SERP archive, where reextract would take them for crawl data
+    collector.ARCHIVE_DIR = os.path.join(collector.DATASET_DIR, 'serp_archive')
+
+    jobs = collector.plan_jobs(time.strftime("%Y-%m-%d"), args.engines, args.contexts)
+    if args.jobs:
+        jobs = jobs[:args.jobs]
+
+    run_collector = collector.Collector(scheduler, region_in_flight=args.region_in_flight)
+    completed, failed = run_collector.run(jobs)
+    stats = run_collector.stats()
+
+    print(f"{len(jobs)} jobs ({completed} completed, {failed} failed), {client.invocations} invocations, "
+          f"{client.rotations} rotations, output in {collector.DATASET_DIR}")
+    print(f"elapsed            {stats['elapsed_s']:8.1f} s")
+    print(f"pages/sec          {stats['pages_per_s']:8.2f}")
+    print(f"calls              {stats['calls']}")
+    print(f"job completion p50 {stats['job_p50_s']:8.1f} s")
+    print(f"job completion max {stats['job_max_s']:8.1f} s")
+    print(f"worker utilization {stats['worker_utilization'] * 100:8.1f} % of {args.workers} threads")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Run the collector against a local Lambda stand-in")
+    parser.add_argument('--mode', choices=['fixtures', 'handler'], default='fixtures')
+    parser.add_argument('--fixtures', default=os.path.join(current_dir, 'fixtures'))
+    parser.add_argument('--engines', nargs='+', default=['google_news'], choices=list(ENGINES))
+    parser.add_argument('--contexts', nargs='+', default=list(CONTEXTS), choices=list(CONTEXTS))
+    parser.add_argument('--jobs', type=int, default=0, help="Only run the first N planned jobs")
+    parser.add_argument('--workers', type=int, default=60)
+    parser.add_argument('--region-in-flight', type=int, default=collector.REGION_IN_FLIGHT)
+    parser.add_argument('--latency', type=float, default=0.5, help="Seconds per invocation")
+    parser.add_argument('--jitter', type=float, default=0.2)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--empty-rate', type=float, default=0.0, help="Share of pages returned without results")
+    parser.add_argument('--page-interval', type=float, default=0.0, help="Politeness seconds between pages per function")
+    parser.add_argument('--interaction-interval', type=float, default=0.0)
+    parser.add_argument('--verbose', action='store_true')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING,
+                        format='%(asctime)s - %(levelname)s - %(message)s')
+    run(args)
@@ -0,0 +1,66 @@
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+from Serverless_Functions.serp_extractor import BACKENDS, LAYOUTS, get_backend
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+
+
+def load_fixtures(fixtures_dir):
+    """Fixtures are saved result pages named <layout>__<anything>.html"""
+    fixtures = []
+    for file_name in sorted(os.listdir(fixtures_dir)):
+        if not file_name.endswith('.html'):
+            continue
+        layout_name = file_name.split('__')[0]
+        if layout_name not in LAYOUTS:
+            print(f"Skipping fixture with unknown layout: {file_name}")
+            continue
+        with open(os.path.join(fixtures_dir, file_name), 'r', encoding='utf-8') as f:
+            fixtures.append((file_name, layout_name, f.read()))
+    return fixtures
+
+
+def run(fixtures, backend_names, repeat):
+    backends = []
+    for name in backend_names:
+        try:
+            backends.append(get_backend(name))
+        except ImportError:
+            print(f"{name:<12} not installed, skipped")
+
+    reference = get_backend('bs4')
+    for file_name, layout_name, html in fixtures:
+        expected = reference.extract(html, LAYOUTS[layout_name])
+        for backend in backends:
+            rows = backend.extract(html, LAYOUTS[layout_name])
+            if rows != expected:
+                print(f"MISMATCH {backend.name}: {file_name} ({len(rows)} rows vs {len(expected)} reference rows)")
+
+    total_bytes = sum(len(html) for _, _, html in fixtures)
+    print(f"{len(fixtures)} fixtures, {total_bytes / 1024:.0f} KB, {repeat} rounds")
+    baseline = None
+    for backend in backends:
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for _, layout_name, html in fixtures:
+                backend.extract(html, LAYOUTS[layout_name])
+        elapsed = time.perf_counter() - start
+        pages = repeat * len(fixtures)
+        if backend.name == 'bs4':
+            baseline = elapsed
+        speedup = f"{baseline / elapsed:6.1f}x" if baseline else "     -"
+        print(f"{backend.name:<12} {pages / elapsed:8.1f} pages/s  {elapsed / pages * 1000:8.2f} ms/page  {speedup}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Compare SERP extraction backends on saved result pages")
+    parser.add_argument('--fixtures', default=os.path.join(current_dir, 'fixtures'))
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--backends', nargs='+', default=['bs4'] + [name for name in BACKENDS if name != 'bs4'])
+    args = parser.parse_args()
+
+    run(load_fixtures(args.fixtures), args.backends, args.repeat)
@@ -0,0 +1,69 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+
+class CheckpointJournal:
+    """
+    Append-only record of fetched result pages and finished tasks for one collection date.
+
+    Rows are keyed by (engine, context, topic, variant, scope): scope is '' for a context's
+    single result set and e.g. 'snapshot-10' for a search-history snapshot. SQLite runs in WAL
+    mode, so every committed page survives a crash of the collector.
+    """
+    def __init__(self, path):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("""CREATE TABLE IF NOT EXISTS pages (
+            engine TEXT, context TEXT, topic TEXT, variant TEXT, scope TEXT,
+            start INTEGER, rows TEXT, fetched_at REAL,
+            PRIMARY KEY (engine, context, topic, variant, scope, start))""")
+        self.conn.execute("""CREATE TABLE IF NOT EXISTS tasks (
+            engine TEXT, context TEXT, topic TEXT, variant TEXT, task TEXT, completed_at REAL,
+            PRIMARY KEY (engine, context, topic, variant, task))""")
+
+    def pages(self, key, scope=''):
+        """[(start, rows)] already fetched for the job, in page order"""
+        with self.lock:
+            cursor = self.conn.execute(
+                "SELECT start, rows FROM pages WHERE engine=? AND context=? AND topic=? AND variant=? AND scope=? ORDER BY start",
+                (*key, scope))
+            return [(start, [tuple(row) for row in json.loads(rows)]) for start, rows in cursor]
+
+    def record_page(self, key, scope, start, rows):
+        with self.lock:
+            self.conn.execute("INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                              (*key, scope, start, json.dumps(rows), time.time()))
+
+    def is_done(self, key, task):
+        with self.lock:
+            cursor = self.conn.execute(
+                "SELECT 1 FROM tasks WHERE engine=? AND context=? AND topic=? AND variant=? AND task=?",
+                (*key, task))
+            return cursor.fetchone() is not None
+
+    def mark_done(self, key, task):
+        with self.lock:
+            self.conn.execute("INSERT OR REPLACE INTO tasks VALUES (?, ?, ?, ?, ?, ?)", (*key, task, time.time()))
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+_journals = {}
+_journals_lock = threading.Lock()
+
+
+def get_journal(path):
+    path = os.path.abspath(path)
+    with _journals_lock:
+        if path not in _journals:
+            _journals[path] = CheckpointJournal(path)
+        return _journals[path]
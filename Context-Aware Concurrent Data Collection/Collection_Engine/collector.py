@@ -0,0 +1,465 @@
+"""
+Unified collector for every (engine x context x topic) job.
+
+Each job is a step generator: it yields ('page' | 'interaction', payload) for every Lambda call
+it needs and receives the Lambda response (None on failure) back. The Collector feeds all
+jobs through one RateScheduler and hands each call to the LambdaInvoker's event loop, so a
+worker thread is only held while a step is processed, never for the Lambda round trip, and
+thousands of jobs share the same pool instead of one thread per job.
+"""
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter, defaultdict, deque
+
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from Serverless_Functions.identity_rotator import get_rotator
+from Serverless_Functions.lambda_invoker import get_invoker
+from Serverless_Functions.serp_extractor import LAYOUTS, google_history_links, layout_for, response_body, rows_from_response
+from Collection_Engine.rate_scheduler import get_scheduler
+from Collection_Engine.context_provider import get_provider, sample_cookies
+from Collection_Engine.checkpoint import get_journal
+from Collection_Engine.serp_archive import get_archive
+from Collection_Engine.dataset_store import file_name, get_store
+from Collection_Engine.specs import CONTEXTS, ENGINES, MAX_PAGE_ATTEMPTS, MAX_RESULTS, PAGE_SIZE
+
+base_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+DATASET_DIR = os.path.join(base_dir, '../dataset')
+ARCHIVE_DIR = os.path.join(base_dir, '../serp_archive')
+ARCHIVE_RAW = True  # Ask Lambda for the raw page too and keep it in the SERP archive
+STORE_NAME = 'search_results'  # Partitioned Parquet store the downstream stages read
+WRITE_CSV = False  # Also write the legacy <date>/<engine>/<context>/<topic>_<variant>.csv tree
+
+COLUMNS = ['page', 'rank', 'source', 'title', 'content', 'url']
+
+# Lambda calls allowed in flight per region, so the busy us-west-1 fleet cannot take every worker
+REGION_IN_FLIGHT = 30
+
+
+class CollectionJob:
+    def __init__(self, engine, context, topic, variant, aws_function, created_date,
+                 perspective='neutral', history_type=None, terms=None):
+        self.engine = engine
+        self.context = context
+        self.topic = topic
+        self.variant = variant
+        self.aws_function = aws_function
+        self.created_date = created_date
+        self.perspective = perspective
+        self.history_type = history_type
+        self.terms = terms or []
+        self.started = None
+
+    @property
+    def key(self):
+        return (self.engine, self.context, self.topic, self.variant)
+
+    @property
+    def journal(self):
+        return get_journal(os.path.join(DATASET_DIR, self.created_date, 'checkpoint.db'))
+
+    @property
+    def layout(self):
+        if CONTEXTS[self.context].get('mobile_layouts'):
+            return layout_for(self.engine, self.variant)
+        return self.engine
+
+    def __repr__(self):
+        return f"{self.engine}/{self.context} topic={self.topic} variant={self.variant}"
+
+
+def request_identity(job):
+    """Cookies and headers for the job's next request"""
+    engine = ENGINES[job.engine]
+    context = CONTEXTS[job.context]
+    provider = get_provider(os.path.join(base_dir, job.engine))
+
+    cookies = provider.cookies(job.perspective, engine['cookie_domain'])
+    if context['sample_cookies'] and engine['cookie_subset']:
+        if job.variant in context.get('sample_all_cookies', []):
+            cookies = sample_cookies(cookies)
+        else:
+            cookies = sample_cookies(cookies, engine['cookie_subset'])
+
+    key = context['headers_key']
+    if key == 'variant':
+        key = job.variant
+    elif key == 'perspective':
+        key = job.perspective
+    return cookies, provider.headers(context['headers_file'], key)
+
+
+def write_results(created_date, engine, context, topic, variant, rows, csv_dir=None):
+    """Store one result list as its (date, engine, context, topic, variant) partition; returns the path"""
+    df = pd.DataFrame(rows, columns=COLUMNS)
+    path = get_store(STORE_NAME).write(df, created_date, engine, context, topic, variant)
+    if csv_dir:
+        dir_path = os.path.join(csv_dir, created_date, engine, context)
+        os.makedirs(dir_path, exist_ok=True)
+        df.to_csv(os.path.join(dir_path, file_name(topic, variant)), index=False)
+    return path
+
+
+def save_rows(job, rows, variant):
+    path = write_results(job.created_date, job.engine, job.context, job.topic, variant, rows,
+                         DATASET_DIR if WRITE_CSV else None)
+    logging.info(f"Data saved to {path}")
+
+
+def archive_page(job, scope, start, response, rows):
+    if response.get('statusCode') != 200:
+        return
+    try:
+        html = response_body(response)
+        if html:
+            get_archive(ARCHIVE_DIR).record(job.created_date, job.engine, job.context, job.topic, job.variant,
+                                            scope, start // PAGE_SIZE + 1, job.layout, html, len(rows))
+    except Exception as e:
+        logging.error(f"Error archiving page: start={start}, {job} | {str(e)}")
+
+
+def result_pages(job, scope=''):
+    """
+    Paginate the topic's news results; returns ((page, rank, source, title, content, url) rows,
+    whether pagination completed). Pages already in the checkpoint journal are reused and
+    fetching resumes after the last one.
+    """
+    engine = ENGINES[job.engine]
+    arn = job.aws_function['arn']
+    region = job.aws_function['region']
+    layout = job.layout
+
+    rows = []
+    start = 0
+    for page_start, page_rows in job.journal.pages(job.key, scope):
+        rows.extend(page_rows)
+        start = page_start + PAGE_SIZE
+    if rows:
+        logging.info(f"Resuming from checkpoint: start={start}, count={len(rows)}, {job}")
+
+    attempts = 0
+    while len(rows) <= MAX_RESULTS and start <= MAX_RESULTS:
+        cookies, headers = request_identity(job)
+        params = {'q': job.topic, **engine['params']}
+        if start > 0:
+            params[engine['offset_param']] = str(start)
+
+        response = yield 'page', {
+            "url": engine['url'],
+            "params": params,
+            "cookies": cookies,
+            "headers": headers,
+            "extract": layout,
+            "raw": ARCHIVE_RAW
+        }
+
+        page_rows = []
+        if response:
+            try:
+                page_rows = rows_from_response(response, layout)
+            except Exception as e:
+                logging.error(f"Error parsing results: {job} | {str(e)}")
+            if ARCHIVE_RAW:
+                archive_page(job, scope, start, response, page_rows)
+
+        if not page_rows:
+            attempts += 1
+            logging.info(f"No results found: start={start}, {job}, attempt={attempts}")
+            if attempts >= MAX_PAGE_ATTEMPTS:
+                logging.warning(f"Giving up after {attempts} attempts: start={start}, {job}")
+                return rows, False
+            get_rotator().rotate(region, arn)
+            continue
+
+        attempts = 0
+        page = start // PAGE_SIZE + 1
+        fetched = []
+        for row in page_rows:
+            fetched.append((page, len(rows) + len(fetched) + 1) + tuple(row))
+            if len(rows) + len(fetched) > MAX_RESULTS:
+                break
+        job.journal.record_page(job.key, scope, start, fetched)
+        rows.extend(fetched)
+
+        logging.info(f"topic={job.topic:<20}|PF setting={job.variant:<10}|page={page:<5}|count={len(rows):<5}")
+        start += PAGE_SIZE
+
+    return rows, True
+
+
+def history_links(engine, response):
+    """(title, url) pairs to click on a search-history result page"""
+    if not response:
+        return []
+    layout_name = ENGINES[engine]['history']['extract']
+    if layout_name in LAYOUTS:
+        return [(title, url) for _, title, _, url in rows_from_response(response, layout_name)]
+    return google_history_links(response_body(response))
+
+
+def replay_term(job, num, term):
+    """Search one history term and click its top results; returns whether the search went through"""
+    context = CONTEXTS[job.context]
+    history = ENGINES[job.engine]['history']
+    cookies, headers = request_identity(job)
+    logging.info(f"Processing term {num}: {term}, {job}")
+
+    payload = {
+        "url": history['url'],
+        "params": {'q': term, **history['params']},
+        "cookies": cookies,
+        "headers": headers
+    }
+    if history['extract']:
+        payload['extract'] = history['extract']
+    response = yield 'interaction', payload
+
+    try:
+        links = history_links(job.engine, response)
+    except Exception as e:
+        logging.error(f"Error parsing term {num}: {job} | {str(e)}")
+        links = []
+
+    if response and not links:
+        logging.info(f"No results found for term: {term}, {job}")
+        get_rotator().rotate(job.aws_function['region'], job.aws_function['arn'])
+
+    for idx, (title, url) in enumerate(links[:context['clicks_per_term']]):
+        yield 'interaction', {
+            "url": url,
+            "params": None,
+            "cookies": cookies,
+            "headers": headers
+        }
+        logging.info(f"Interaction {idx} for term {num}: {title[:30]}, {job}")
+    return response is not None
+
+
+def history_steps(job):
+    """Replay the perspective's search terms with clicks, storing result pages at the snapshots"""
+    context = CONTEXTS[job.context]
+
+    for num, term in enumerate(job.terms[:context['max_terms']]):
+        snapshot = f"snapshot-{num+1}" if num in context['snapshots'] else None
+        if snapshot and job.journal.is_done(job.key, snapshot):
+            continue
+
+        if not job.journal.is_done(job.key, f"term-{num}"):
+            searched = yield from replay_term(job, num, term)
+            if searched:
+                job.journal.mark_done(job.key, f"term-{num}")
+
+        if snapshot:
+            rows, complete = yield from result_pages(job, snapshot)
+            save_rows(job, rows, f"{job.variant}_{num+1}")
+            if complete:
+                job.journal.mark_done(job.key, snapshot)
+
+
+def page_steps(job):
+    if job.journal.is_done(job.key, 'saved'):
+        logging.info(f"Already collected, skipping: {job}")
+        return
+    rows, complete = yield from result_pages(job)
+    save_rows(job, rows, job.variant)
+    if complete:
+        job.journal.mark_done(job.key, 'saved')
+
+
+def job_steps(job):
+    if 'snapshots' in CONTEXTS[job.context]:
+        return history_steps(job)
+    return page_steps(job)
+
+
+def load_search_history(file_path):
+    """[(topic, history_type, perspective, terms)] from `<topic>_<type>_<perspective>` columns"""
+    df = pd.read_csv(file_path)
+    histories = []
+    for column in df.columns:
+        topic_type, perspective = column.rsplit('_', 1)
+        topic, search_history_type = topic_type.split('_', 1)
+        histories.append((topic, search_history_type, perspective, df[column].dropna().tolist()))
+    return histories
+
+
+def interleave(groups):
+    """Round-robin merge, so every context starts right away instead of queueing behind the others"""
+    queues = [deque(group) for group in groups if group]
+    merged = []
+    while queues:
+        for queue in list(queues):
+            merged.append(queue.popleft())
+            if not queue:
+                queues.remove(queue)
+    return merged
+
+
+def plan_jobs(created_date, engines=None, contexts=None):
+    """Expand the engine and context specs into one job list, interleaved across contexts"""
+    with open(os.path.join(base_dir, 'aws_functions.json')) as f:
+        aws = json.load(f)
+    topics = pd.read_csv(os.path.join(base_dir, 'topic.csv'))['query'].tolist()
+
+    groups = []
+    for engine in engines or list(ENGINES):
+        # One round-robin position per engine, so its contexts spread over the whole fleet
+        aws_functions = aws['us-west-1']
+        aws_index = 0
+        for context_name in contexts or list(CONTEXTS):
+            context = CONTEXTS[context_name]
+            jobs = []
+            groups.append(jobs)
+            if 'variants_file' in context:
+                for topic, search_history_type, perspective, terms in load_search_history(os.path.join(base_dir, context['variants_file'])):
+                    jobs.append(CollectionJob(engine, context_name, topic, f"{search_history_type}_{perspective}",
+                                              aws_functions[aws_index], created_date,
+                                              perspective=perspective, history_type=search_history_type, terms=terms))
+                    aws_index = (aws_index + 1) % len(aws_functions)
+                continue
+
+            for topic_index, topic in enumerate(topics):
+                for variant in context['variants']:
+                    if context['functions'] == 'per_region':
+                        aws_function = aws[variant][topic_index % len(aws[variant])]
+                    else:
+                        aws_function = aws_functions[aws_index]
+                        aws_index = (aws_index + 1) % len(aws_functions)
+                    jobs.append(CollectionJob(engine, context_name, topic, variant, aws_function, created_date))
+    return interleave(groups)
+
+
+class Collector:
+    """
+    Runs job steps on the scheduler's bounded worker pool and their Lambda calls on the
+    invoker's event loop. In-flight calls are bounded per region by `region_in_flight` and
+    overall by the invoker's `max_in_flight` (and, without aiobotocore, by the threads of its
+    boto3 transport). A call takes its rate token first and only then a region slot, so calls
+    waiting out their politeness delay do not count against the cap. Calls beyond a region's cap
+    wait in a per-region FIFO and are handed the slot of the next call that completes there.
+    """
+    def __init__(self, scheduler=None, invoker=None, region_in_flight=REGION_IN_FLIGHT, region_limits=None):
+        self.scheduler = scheduler or get_scheduler()
+        self.invoker = invoker or get_invoker()
+        self.region_in_flight = region_in_flight
+        self.region_limits = dict(region_limits or {})
+        self.in_flight = defaultdict(int)
+        self.waiting = defaultdict(deque)
+        self.condition = threading.Condition()
+        self.active = 0
+        self.completed = 0
+        self.failed = 0
+        self.remaining = defaultdict(int)
+        self.started = None
+        self.finished = None
+        self.calls = Counter()
+        self.busy = 0.0
+        self.durations = []
+
+    def region_limit(self, region):
+        return self.region_limits.get(region, self.region_in_flight)
+
+    def run(self, jobs):
+        """Queue every job on the shared pool and block until all have finished"""
+        jobs = list(jobs)
+        logging.info(f"Queueing {len(jobs)} collection jobs")
+        with self.condition:
+            self.active += len(jobs)
+            for job in jobs:
+                self.remaining[(job.engine, job.context)] += 1
+        self.started = time.monotonic()
+        for job in jobs:
+            job.started = time.monotonic()
+            self.advance(job, job_steps(job), None)
+        with self.condition:
+            while self.active:
+                self.condition.wait()
+            self.finished = time.monotonic()
+        logging.info(f"Collection finished in {time.monotonic() - self.started:.0f}s: completed={self.completed}, failed={self.failed}")
+        return self.completed, self.failed
+
+    def advance(self, job, steps, response):
+        try:
+            kind, payload = steps.send(response)
+        except StopIteration:
+            self.finish(job, True)
+            return
+        except Exception as e:
+            logging.error(f"Job failed: {job} | {str(e)}")
+            self.finish(job, False)
+            return
+        self.scheduler.submit(job.engine, job.aws_function['arn'], self.start_call, job, steps, kind, payload, kind=kind)
+
+    def start_call(self, job, steps, kind, payload):
+        """Runs once the call's rate token is ready: takes a region slot or queues for the next free one"""
+        region = job.aws_function['region']
+        with self.condition:
+            if self.in_flight[region] >= self.region_limit(region):
+                self.waiting[region].append((job, steps, kind, payload))
+                return
+            self.in_flight[region] += 1
+        self.execute(job, steps, kind, payload)
+
+    def execute(self, job, steps, kind, payload):
+        """Start the call on the invoker's loop; the worker returns at once and the response is handled on completion"""
+        future = self.invoker.invoke_async(job.aws_function['region'], job.aws_function['arn'], json.dumps(payload))
+        future.add_done_callback(lambda done: self.scheduler.call_soon(self.complete, job, steps, kind, done))
+
+    def complete(self, job, steps, kind, future):
+        started = time.monotonic()
+        try:
+            response = future.result()
+        except Exception as e:
+            logging.error(f"Error invoking Lambda function: {job.aws_function} | {str(e)}")
+            response = None
+        self.release(job.aws_function['region'])
+        self.advance(job, steps, response)
+        with self.condition:
+            self.calls[kind] += 1
+            self.busy += time.monotonic() - started
+
+    def release(self, region):
+        with self.condition:
+            if not self.waiting[region]:
+                self.in_flight[region] -= 1
+                return
+            queued = self.waiting[region].popleft()
+        self.execute(*queued)
+
+    def finish(self, job, succeeded):
+        with self.condition:
+            if succeeded:
+                self.completed += 1
+            else:
+                self.failed += 1
+            self.active -= 1
+            self.durations.append(time.monotonic() - job.started)
+            key = (job.engine, job.context)
+            self.remaining[key] -= 1
+            if not self.remaining[key]:
+                logging.info(f"Context {job.engine}/{job.context} finished after {time.monotonic() - self.started:.0f}s")
+            self.condition.notify_all()
+
+    def stats(self):
+        """Throughput and worker utilization of the last run()"""
+        with self.condition:
+            elapsed = ((self.finished or time.monotonic()) - self.started) if self.started else 0.0
+            durations = sorted(self.durations)
+            workers = self.scheduler.max_workers
+            return {
+                'elapsed_s': elapsed,
+                'calls': dict(self.calls),
+                'pages_per_s': self.calls['page'] / elapsed if elapsed else 0.0,
+                'job_p50_s': durations[len(durations) // 2] if durations else 0.0,
+                'job_max_s': durations[-1] if durations else 0.0,
+                'worker_utilization': self.busy / (workers * elapsed) if elapsed else 0.0,
+            }
+
+
+def collect(created_date, engines=None, contexts=None, region_limits=None):
+    return Collector(region_limits=region_limits).run(plan_jobs(created_date, engines, contexts))
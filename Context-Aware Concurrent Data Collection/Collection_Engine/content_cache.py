@@ -0,0 +1,200 @@
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+DEFAULT_PORTS = {'http': '80', 'https': '443'}
+TRACKING_PARAMS = ('utm_', 'ocid', 'cvid')
+FAILURE_TTL = 24 * 3600  # Skip a failed URL this long after its first failure
+MAX_FAILURE_TTL = 30 * 24 * 3600  # The wait doubles with every further failure, up to this
+
+
+def normalize_url(url):
+    """
+    Cache key for an article URL: scheme and host lower-cased, default port and fragment
+    dropped, tracking parameters (utm_*, MSN's ocid/cvid) removed from the query
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    netloc = parts.netloc.lower()
+    host, _, port = netloc.rpartition(':')
+    if host and DEFAULT_PORTS.get(scheme) == port:
+        netloc = host
+    query = urlencode([(key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+                       if not key.lower().startswith(TRACKING_PARAMS)])
+    return urlunsplit((scheme, netloc, parts.path or '/', query, ''))
+
+
+class ContentCache:
+    """
+    Extracted article text keyed by normalized URL.
+
+    Every entry is its own SQLite row written on `put`, and lookups go to disk instead of a dict
+    loaded at startup. WAL mode lets the url_to_content threads and other processes read while
+    one of them writes. Failed extractions are remembered with their reason and attempt count,
+    and `failure` reports them until their retry time so reruns skip known-bad URLs.
+    """
+    def __init__(self, path, failure_ttl=FAILURE_TTL, max_failure_ttl=MAX_FAILURE_TTL):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.failure_ttl = failure_ttl
+        self.max_failure_ttl = max_failure_ttl
+        self.lock = threading.Lock()
+        self.created = not os.path.exists(path)
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("""CREATE TABLE IF NOT EXISTS contents (
+            url TEXT PRIMARY KEY, content TEXT, fetched_at REAL)""")
+        self.conn.execute("""CREATE TABLE IF NOT EXISTS failures (
+            url TEXT PRIMARY KEY, reason TEXT, attempts INTEGER, failed_at REAL, retry_at REAL)""")
+        self.conn.execute("""CREATE TABLE IF NOT EXISTS validators (
+            url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT)""")
+        self.conn.execute("""CREATE TABLE IF NOT EXISTS domains (
+            domain TEXT, tier TEXT, attempts INTEGER, successes INTEGER, updated_at REAL,
+            PRIMARY KEY (domain, tier))""")
+
+    def get(self, url):
+        """Cached content of the URL, or None"""
+        with self.lock:
+            row = self.conn.execute("SELECT content FROM contents WHERE url=?", (normalize_url(url),)).fetchone()
+        return row[0] if row else None
+
+    def __contains__(self, url):
+        return self.get(url) is not None
+
+    def put(self, url, content, etag=None, last_modified=None):
+        """Store content; the response's ETag/Last-Modified are kept for conditional revalidation"""
+        key = normalize_url(url)
+        with self.lock:
+            self.conn.execute("INSERT OR REPLACE INTO contents VALUES (?, ?, ?)", (key, content, time.time()))
+            self.conn.execute("DELETE FROM failures WHERE url=?", (key,))
+            if etag or last_modified:
+                self.conn.execute("INSERT OR REPLACE INTO validators VALUES (?, ?, ?)", (key, etag, last_modified))
+
+    def validators(self, url):
+        """(etag, last_modified) of the cached response, or None"""
+        with self.lock:
+            row = self.conn.execute("SELECT etag, last_modified FROM validators WHERE url=?",
+                                    (normalize_url(url),)).fetchone()
+        return tuple(row) if row else None
+
+    def failure(self, url, now=None):
+        """{'reason', 'attempts', 'failed_at', 'retry_at'} while the URL should still be skipped, else None"""
+        with self.lock:
+            row = self.conn.execute("SELECT reason, attempts, failed_at, retry_at FROM failures WHERE url=?",
+                                    (normalize_url(url),)).fetchone()
+        if row is None or row[3] <= (now or time.time()):
+            return None
+        return dict(zip(('reason', 'attempts', 'failed_at', 'retry_at'), row))
+
+    def unresolved(self, urls, now=None):
+        """The given URLs that have no cached content and no failure still waiting for its retry time"""
+        keys = {normalize_url(url): url for url in urls}
+        resolved = set()
+        pending = list(keys)
+        with self.lock:
+            for i in range(0, len(pending), 500):
+                chunk = pending[i:i + 500]
+                marks = ','.join('?' * len(chunk))
+                resolved.update(row[0] for row in self.conn.execute(
+                    f"SELECT url FROM contents WHERE url IN ({marks})", chunk))
+                resolved.update(row[0] for row in self.conn.execute(
+                    f"SELECT url FROM failures WHERE url IN ({marks}) AND retry_at>?", (*chunk, now or time.time())))
+        return {url for key, url in keys.items() if key not in resolved}
+
+    def record_failure(self, url, reason):
+        """Count a failed extraction; returns the attempt count"""
+        key = normalize_url(url)
+        now = time.time()
+        with self.lock:
+            row = self.conn.execute("SELECT attempts FROM failures WHERE url=?", (key,)).fetchone()
+            attempts = (row[0] if row else 0) + 1
+            retry_at = now + min(self.failure_ttl * 2 ** (attempts - 1), self.max_failure_ttl)
+            self.conn.execute("INSERT OR REPLACE INTO failures VALUES (?, ?, ?, ?, ?)",
+                              (key, str(reason), attempts, now, retry_at))
+        return attempts
+
+    def domain_stats(self, domain, since=0):
+        """{tier: (attempts, successes, updated_at)} of a publisher domain, ignoring tiers not updated since `since`"""
+        with self.lock:
+            cursor = self.conn.execute(
+                "SELECT tier, attempts, successes, updated_at FROM domains WHERE domain=? AND updated_at>=?",
+                (domain, since))
+            return {tier: (attempts, successes, updated_at) for tier, attempts, successes, updated_at in cursor}
+
+    def record_domain(self, domain, tier, ok, since=0):
+        """Count one outcome of a tier on a domain; counts last updated before `since` start over"""
+        with self.lock:
+            row = self.conn.execute("SELECT attempts, successes FROM domains WHERE domain=? AND tier=? AND updated_at>=?",
+                                    (domain, tier, since)).fetchone()
+            attempts, successes = row or (0, 0)
+            self.conn.execute("INSERT OR REPLACE INTO domains VALUES (?, ?, ?, ?, ?)",
+                              (domain, tier, attempts + 1, successes + (1 if ok else 0), time.time()))
+
+    def clear_failures(self):
+        """Forget every recorded failure so the next run retries all of them"""
+        with self.lock:
+            self.conn.execute("DELETE FROM failures")
+
+    def __len__(self):
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM contents").fetchone()[0]
+
+    def import_pickle(self, path):
+        """Load a legacy {url: content} pickle (url_content_cache.pkl) in one transaction; returns the entry count"""
+        with open(path, 'rb') as f:
+            cache = pickle.load(f)
+        now = time.time()
+        with self.lock:
+            self.conn.execute("BEGIN")
+            self.conn.executemany("INSERT OR REPLACE INTO contents VALUES (?, ?, ?)",
+                                  [(normalize_url(url), content, now) for url, content in cache.items() if content])
+            self.conn.execute("COMMIT")
+        return len(cache)
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+class SingleFlight:
+    """Coalesce concurrent calls for the same key: one caller runs the function, the others wait for its result"""
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = {}
+
+    def do(self, key, func, *args):
+        with self.lock:
+            call = self.calls.get(key)
+            leader = call is None
+            if leader:
+                call = self.calls[key] = {'done': threading.Event(), 'result': None, 'error': None}
+        if not leader:
+            call['done'].wait()
+        else:
+            try:
+                call['result'] = func(*args)
+            except Exception as e:
+                call['error'] = e
+            finally:
+                with self.lock:
+                    del self.calls[key]
+                call['done'].set()
+        if call['error'] is not None:
+            raise call['error']
+        return call['result']
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_content_cache(path):
+    path = os.path.abspath(path)
+    with _caches_lock:
+        if path not in _caches:
+            _caches[path] = ContentCache(path)
+        return _caches[path]
@@ -0,0 +1,83 @@
+"""
+Streaming write-back of Article_Content for url_to_content.
+
+The writer stands in for the {normalized URL: content} mapping the fetch stages fill. Each
+assignment resolves that URL in every partition referencing it, and a partition is written as
+soon as its last URL resolves, instead of after the whole run. Extracted text is already kept
+per URL in the content cache, so a restarted run re-resolves finished URLs from the cache and
+only the partitions still missing URLs wait on the network. Partitions with a deferred URL (left
+for a later run) or a URL that never resolved are not written, so the next run picks them up again.
+Each write is told how many of the partition's URLs resolved without content, for the catalog.
+"""
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class StreamingContentWriter:
+    def __init__(self, partitions, partition_urls, write, max_workers=5):
+        """
+        `partition_urls[i]` is the set of normalized URLs partition `partitions[i]` references;
+        write(partition, writer, missing) materializes one partition, reading contents back via get();
+        `missing` counts its URLs that resolved to no content
+        """
+        self.partitions = partitions
+        self.partition_urls = partition_urls
+        self.write = write
+        self.lock = threading.Lock()
+        self.contents = {}
+        self.pending = [set(urls) for urls in partition_urls]
+        self.waiting = {}
+        for i, urls in enumerate(self.pending):
+            for url in urls:
+                self.waiting.setdefault(url, []).append(i)
+        self.written = set()
+        self.deferred = set()
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='content-writer')
+        self.futures = []
+        # Partitions without URLs have nothing to wait for
+        for i, urls in enumerate(self.pending):
+            if not urls:
+                self.submit(i)
+
+    def submit(self, i):
+        self.written.add(i)
+        missing = sum(1 for url in self.partition_urls[i] if self.contents.get(url) is None)
+        self.futures.append(self.executor.submit(self.write, self.partitions[i], self, missing))
+
+    def __setitem__(self, url, content):
+        with self.lock:
+            self.contents[url] = content
+            for i in self.waiting.pop(url, []):
+                self.pending[i].discard(url)
+                if not self.pending[i] and i not in self.written and i not in self.deferred:
+                    self.submit(i)
+
+    def defer(self, url):
+        """Leave the URL for a later run: partitions referencing it are not written"""
+        with self.lock:
+            for i in self.waiting.pop(url, []):
+                self.deferred.add(i)
+
+    def __getitem__(self, url):
+        with self.lock:
+            return self.contents[url]
+
+    def get(self, url, default=None):
+        with self.lock:
+            return self.contents.get(url, default)
+
+    def __len__(self):
+        with self.lock:
+            return len(self.contents)
+
+    def close(self):
+        """Wait for every write; partitions with deferred or unresolved URLs stay unwritten. Returns the number written"""
+        with self.lock:
+            remaining = len(self.partitions) - len(self.written)
+        if remaining:
+            logging.info(f"{remaining} partitions left for the next run")
+        for future in self.futures:
+            future.result()
+        self.executor.shutdown()
+        return len(self.written)
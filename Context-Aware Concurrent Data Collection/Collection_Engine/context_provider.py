@@ -0,0 +1,97 @@
+import copy
+import json
+import os
+import random
+import threading
+import time
+
+
+COOKIE_TTL = 600  # Seconds before browser cookies are decrypted again, even if the DB is untouched
+
+
+def load_browser_cookies(cookie_file, domain_name):
+    import browser_cookie3
+    jar = browser_cookie3.chrome(domain_name=domain_name, cookie_file=cookie_file)
+    return {cookie.name: cookie.value for cookie in jar}
+
+
+def file_mtime(path):
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return None
+
+
+class ContextProvider:
+    """
+    Cached access to a collector's cookies and header JSON files.
+
+    JSON files are re-read only when their mtime changes. Browser cookies are decrypted
+    once per (cookie DB, domain) and reused until the TTL expires or the DB is modified,
+    so pagination loops no longer hit SQLite and the keyring on every page.
+    """
+    def __init__(self, base_dir, cookie_ttl=COOKIE_TTL, cookie_loader=load_browser_cookies):
+        self.base_dir = base_dir
+        self.cookie_ttl = cookie_ttl
+        # (cookie_file, domain_name) -> {name: value}; replaceable for offline runs
+        self.cookie_loader = cookie_loader
+        self.json_cache = {}
+        self.cookie_cache = {}
+        self.lock = threading.Lock()
+        self.cookie_lock = threading.Lock()
+
+    def cached_json(self, file_name):
+        """Shared parsed JSON; callers must not mutate it"""
+        file_path = os.path.join(self.base_dir, file_name)
+        mtime = file_mtime(file_path)
+        with self.lock:
+            cached = self.json_cache.get(file_path)
+            if cached is None or cached[0] != mtime:
+                with open(file_path, 'r') as file:
+                    cached = (mtime, json.load(file))
+                self.json_cache[file_path] = cached
+        return cached[1]
+
+    def load_json(self, file_name):
+        return copy.deepcopy(self.cached_json(file_name))
+
+    def headers(self, file_name, key):
+        return copy.deepcopy(self.cached_json(file_name)[key])
+
+    def cookies(self, perspective, domain_name):
+        cookie_file = self.cached_json('cookies.json')[perspective]['file']
+        key = (cookie_file, domain_name)
+        mtime = file_mtime(cookie_file)
+        # A single lock keeps concurrent workers from decrypting the same DB in parallel
+        with self.cookie_lock:
+            cached = self.cookie_cache.get(key)
+            if cached is None or cached[1] != mtime or time.monotonic() - cached[0] > self.cookie_ttl:
+                cached = (time.monotonic(), mtime, self.cookie_loader(cookie_file, domain_name))
+                self.cookie_cache[key] = cached
+        return dict(cached[2])
+
+    def invalidate(self):
+        with self.lock, self.cookie_lock:
+            self.json_cache.clear()
+            self.cookie_cache.clear()
+
+
+def sample_cookies(cookies, cookie_names=None):
+    """Keep a random non-empty combination of `cookie_names` (all cookies when None)"""
+    names = list(cookie_names) if cookie_names is not None else list(cookies)
+    if not names:
+        return {}
+    random_cookies = set(random.sample(names, random.randint(1, len(names))))
+    return {name: value for name, value in cookies.items() if name in random_cookies}
+
+
+_providers = {}
+_providers_lock = threading.Lock()
+
+
+def get_provider(base_dir):
+    base_dir = os.path.abspath(base_dir)
+    with _providers_lock:
+        if base_dir not in _providers:
+            _providers[base_dir] = ContextProvider(base_dir)
+        return _providers[base_dir]
@@ -0,0 +1,88 @@
+"""
+SQLite catalog of a dataset store's partitions.
+
+One row per (created_date, engine, context, topic, variant) partition with its file path, row
+count, size, mtime and serialized Arrow schema. The store records every write here, so stages
+list and filter partitions with one query instead of walking a year of daily directories, and
+build scans from the matching files without opening every Parquet footer. A writer may also record
+how many of a partition's items it left without content (`missing`, NULL when unknown), so a rerun
+only revisits the partitions that still have gaps.
+"""
+import os
+import sqlite3
+import threading
+
+PARTITION_KEYS = ['created_date', 'engine', 'context', 'topic', 'variant']
+COLUMNS = [*PARTITION_KEYS, 'path', 'rows', 'size', 'mtime', 'schema', 'missing']
+
+
+def key_conditions(date_range=None, exclude=None, **keys):
+    """SQL WHERE clauses and parameters for partition filters, same semantics as DatasetStore.scan"""
+    where, params = [], []
+    for key, value in keys.items():
+        if value is None:
+            continue
+        values = list(value) if isinstance(value, (list, tuple, set)) else [value]
+        where.append(f"{key} IN ({', '.join('?' * len(values))})")
+        params.extend(values)
+    for key, values in (exclude or {}).items():
+        if values:
+            where.append(f"{key} NOT IN ({', '.join('?' * len(values))})")
+            params.extend(values)
+    if date_range:
+        where.append("created_date BETWEEN ? AND ?")
+        params.extend(date_range)
+    return where, params
+
+
+class DatasetCatalog:
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.created = not os.path.exists(path)
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("""CREATE TABLE IF NOT EXISTS partitions (
+            created_date TEXT, engine TEXT, context TEXT, topic TEXT, variant TEXT,
+            path TEXT, rows INTEGER, size INTEGER, mtime REAL, schema BLOB, missing INTEGER,
+            PRIMARY KEY (created_date, engine, context, topic, variant))""")
+        # Catalogs created before the missing column
+        if 'missing' not in [row[1] for row in self.conn.execute("PRAGMA table_info(partitions)")]:
+            self.conn.execute("ALTER TABLE partitions ADD COLUMN missing INTEGER")
+
+    def record(self, partition, path, rows, size, mtime, schema, missing=None):
+        with self.lock:
+            self.conn.execute(f"INSERT OR REPLACE INTO partitions ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})",
+                              (*[partition[key] for key in PARTITION_KEYS], path, rows, size, mtime, schema, missing))
+
+    def set_missing(self, partition, missing):
+        with self.lock:
+            self.conn.execute(
+                "UPDATE partitions SET missing=? WHERE " + " AND ".join(f"{key}=?" for key in PARTITION_KEYS),
+                [missing, *[partition[key] for key in PARTITION_KEYS]])
+
+    def remove(self, partition):
+        with self.lock:
+            self.conn.execute(
+                "DELETE FROM partitions WHERE " + " AND ".join(f"{key}=?" for key in PARTITION_KEYS),
+                [partition[key] for key in PARTITION_KEYS])
+
+    def entries(self, date_range=None, exclude=None, **keys):
+        """Catalog rows as dicts in partition key order, filtered like DatasetStore.partitions"""
+        where, params = key_conditions(date_range, exclude, **keys)
+        query = "SELECT * FROM partitions" + (" WHERE " + " AND ".join(where) if where else "")
+        query += " ORDER BY " + ", ".join(PARTITION_KEYS)
+        with self.lock:
+            cursor = self.conn.execute(query, params)
+            columns = [column[0] for column in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor]
+
+    def mtimes(self):
+        """{path: mtime} of every cataloged file, for reconciling with the filesystem"""
+        with self.lock:
+            return dict(self.conn.execute("SELECT path, mtime FROM partitions"))
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
@@ -0,0 +1,227 @@
+"""
+Partitioned Parquet dataset shared by the collection and analysis stages.
+
+Every stage writes one Parquet file per (created_date, engine, context, topic, variant) under a
+hive layout (`created_date=2026-10-17/engine=google_news/context=region/topic=Abortion/variant=us-west-1/`),
+and records each write in the store's SQLite catalog (dataset_catalog.py). Readers pick partitions
+from the catalog instead of walking the tree and only decode the columns they ask for:
+
+    store = get_store('contents')
+    df = store.scan(columns=['url', 'Article_Content'], date_range=('2026-10-01', '2026-10-17'),
+                    engine='google_news')
+
+    python Collection_Engine/dataset_store.py import ../dataset contents
+    python Collection_Engine/dataset_store.py sync contents
+"""
+import argparse
+import logging
+import os
+import sys
+import threading
+from urllib.parse import quote, unquote
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from Collection_Engine.dataset_catalog import PARTITION_KEYS, DatasetCatalog
+
+STORE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../dataset_store'))
+PART_FILE = 'part-0.parquet'
+CATALOG_FILE = '_catalog.db'  # '_' prefix keeps it out of pyarrow dataset discovery
+
+
+def file_name(topic, variant):
+    """CSV name the stages used before the store: `<topic>_<variant>.csv`"""
+    return f"{topic}_{variant}.csv"
+
+
+def split_file_name(name):
+    """Inverse of file_name(); variants may contain underscores, topics do not"""
+    topic, variant = os.path.splitext(name)[0].split('_', 1)
+    return topic, variant
+
+
+class DatasetStore:
+    def __init__(self, root):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        self.partitioning = ds.partitioning(pa.schema([(key, pa.string()) for key in PARTITION_KEYS]), flavor='hive')
+        self.catalog = DatasetCatalog(os.path.join(root, CATALOG_FILE))
+        if self.catalog.created:
+            self.sync()
+
+    def partition_path(self, created_date, engine, context, topic, variant):
+        values = (created_date, engine, context, topic, variant)
+        return os.path.join(self.root, *[f"{key}={quote(str(value), safe='')}" for key, value in zip(PARTITION_KEYS, values)])
+
+    def write(self, df, created_date, engine, context, topic, variant, missing=None):
+        """Replace one partition's rows; readers never see a half-written file. `missing` is cataloged as is"""
+        dir_path = self.partition_path(created_date, engine, context, topic, variant)
+        os.makedirs(dir_path, exist_ok=True)
+        path = os.path.join(dir_path, PART_FILE)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        # A column with no values yet (pandas reads it as float NaN) is stored as null, so it merges with
+        # the text or score column other partitions have under the same name
+        for i, column in enumerate(table.column_names):
+            if table.column(i).null_count == len(table) and table.schema.field(i).type != pa.null():
+                table = table.set_column(i, pa.field(column, pa.null()), pa.nulls(len(table)))
+        pq.write_table(table, tmp_path, compression='zstd')
+        os.replace(tmp_path, path)
+        self.record(dict(zip(PARTITION_KEYS, (created_date, engine, context, topic, variant))), path,
+                    table.num_rows, table.schema, missing)
+        return path
+
+    def record(self, partition, path, rows, schema, missing=None):
+        stat = os.stat(path)
+        self.catalog.record(partition, os.path.relpath(path, self.root), rows, stat.st_size, stat.st_mtime,
+                            schema.remove_metadata().serialize().to_pybytes(), missing)
+
+    def set_missing(self, created_date, engine, context, topic, variant, missing):
+        self.catalog.set_missing(dict(zip(PARTITION_KEYS, (created_date, engine, context, topic, variant))), missing)
+
+    def sync(self):
+        """
+        Reconcile the catalog with files written outside this store (copied trees, older runs):
+        new or modified partitions are cataloged from their Parquet footers, deleted ones dropped
+        """
+        cataloged = self.catalog.mtimes()
+        added = 0
+        for dir_path, _, files in os.walk(self.root):
+            if PART_FILE not in files:
+                continue
+            parts = os.path.relpath(dir_path, self.root).split(os.sep)
+            if len(parts) != len(PARTITION_KEYS):
+                continue
+            path = os.path.join(dir_path, PART_FILE)
+            mtime = cataloged.pop(os.path.relpath(path, self.root), None)
+            if mtime == os.stat(path).st_mtime:
+                continue
+            metadata = pq.read_metadata(path)
+            self.record({key: unquote(part.split('=', 1)[1]) for key, part in zip(PARTITION_KEYS, parts)},
+                        path, metadata.num_rows, metadata.schema.to_arrow_schema())
+            added += 1
+        for stale in cataloged:
+            parts = os.path.dirname(stale).split(os.sep)
+            self.catalog.remove({key: unquote(part.split('=', 1)[1]) for key, part in zip(PARTITION_KEYS, parts)})
+        logging.info(f"Catalog of {self.root} synced: {added} partitions updated, {len(cataloged)} removed")
+        return added, len(cataloged)
+
+    def exists(self, created_date, engine, context, topic, variant):
+        return os.path.exists(os.path.join(self.partition_path(created_date, engine, context, topic, variant), PART_FILE))
+
+    def read_partition(self, created_date, engine, context, topic, variant, columns=None):
+        """One partition's rows in write order, without the partition columns"""
+        path = os.path.join(self.partition_path(created_date, engine, context, topic, variant), PART_FILE)
+        return pq.read_table(path, columns=columns).to_pandas()
+
+    def entries(self, date_range=None, exclude=None, **keys):
+        """Catalog rows (partition keys plus path, rows, size, mtime) matching the filters"""
+        return self.catalog.entries(date_range, exclude, **keys)
+
+    def partitions(self, date_range=None, exclude=None, **keys):
+        """Partition key dicts matching the filters, in key order"""
+        return [{key: entry[key] for key in PARTITION_KEYS} for entry in self.entries(date_range, exclude, **keys)]
+
+    def dataset(self, date_range=None, exclude=None, **keys):
+        """
+        pyarrow dataset over the matching partitions' files. Stages add columns over time (Article_Content,
+        one per model/persona), so the schema is unified across the cataloged schemas instead of taken
+        from the first file
+        """
+        entries = self.entries(date_range, exclude, **keys)
+        schemas = [pa.ipc.read_schema(pa.py_buffer(entry['schema'])) for entry in entries]
+        schema = pa.unify_schemas(schemas + [self.partitioning.schema], promote_options='permissive')
+        return ds.dataset([os.path.join(self.root, entry['path']) for entry in entries], schema=schema,
+                          format='parquet', partitioning=self.partitioning, partition_base_dir=self.root)
+
+    def columns(self, date_range=None, exclude=None, **keys):
+        return self.dataset(date_range, exclude, **keys).schema.names
+
+    def scan(self, columns=None, date_range=None, exclude=None, filter=None, **keys):
+        """
+        Rows of all matching partitions as one DataFrame. Partition filters select files through the
+        catalog, `filter` (a pyarrow expression) is pushed down to the Parquet row groups, and only
+        `columns` plus the partition keys are decoded
+        """
+        if columns is not None:
+            columns = PARTITION_KEYS + [column for column in columns if column not in PARTITION_KEYS]
+        if not self.entries(date_range, exclude, **keys):
+            return pd.DataFrame(columns=columns or PARTITION_KEYS)
+        table = self.dataset(date_range, exclude, **keys).to_table(columns=columns, filter=filter)
+        return table.to_pandas()
+
+    def iter_partitions(self, columns=None, date_range=None, exclude=None, **keys):
+        """(partition keys, DataFrame) per partition, for stages that rewrite partitions one by one"""
+        for partition in self.partitions(date_range, exclude, **keys):
+            yield partition, self.read_partition(columns=columns, **partition)
+
+
+def import_csv_tree(csv_root, store, date_range=None):
+    """Load a legacy `<date>/<engine>/<context>/<topic>_<variant>.csv` tree into the store"""
+    imported = 0
+    for created_date in sorted(os.listdir(csv_root)):
+        if not os.path.isdir(os.path.join(csv_root, created_date)):
+            continue
+        if date_range and not date_range[0] <= created_date <= date_range[1]:
+            continue
+        for dir_path, _, files in os.walk(os.path.join(csv_root, created_date)):
+            parts = os.path.relpath(dir_path, csv_root).split(os.sep)
+            if len(parts) != 3:
+                continue
+            for name in sorted(files):
+                if not name.endswith('.csv'):
+                    continue
+                topic, variant = split_file_name(name)
+                store.write(pd.read_csv(os.path.join(dir_path, name)), *parts, topic, variant)
+                imported += 1
+    logging.info(f"Imported {imported} CSV files from {csv_root} into {store.root}")
+    return imported
+
+
+def export_csv_tree(store, csv_root, date_range=None):
+    """Write partitions back out as the CSV tree the original scripts read"""
+    exported = 0
+    for partition, df in store.iter_partitions(date_range=date_range):
+        dir_path = os.path.join(csv_root, partition['created_date'], partition['engine'], partition['context'])
+        os.makedirs(dir_path, exist_ok=True)
+        df.to_csv(os.path.join(dir_path, file_name(partition['topic'], partition['variant'])), index=False)
+        exported += 1
+    logging.info(f"Exported {exported} partitions from {store.root} to {csv_root}")
+    return exported
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_store(name, root=None):
+    """Store of one pipeline stage, e.g. 'search_results', 'contents', 'results_<date>', 'parsed_<date>'"""
+    path = os.path.abspath(os.path.join(root or STORE_DIR, name))
+    with _stores_lock:
+        if path not in _stores:
+            _stores[path] = DatasetStore(path)
+        return _stores[path]
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Convert between the legacy CSV trees and the Parquet dataset store, or resync its catalog")
+    parser.add_argument('action', choices=['import', 'export', 'sync'])
+    parser.add_argument('csv_root', nargs='?', help="Root of a <date>/<engine>/<context>/<topic>_<variant>.csv tree")
+    parser.add_argument('store', help="Store name under the store root, e.g. search_results or contents")
+    parser.add_argument('--root', default=STORE_DIR)
+    parser.add_argument('--start')
+    parser.add_argument('--end')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    date_range = (args.start, args.end or args.start) if args.start else None
+    if args.action == 'sync':
+        get_store(args.store, args.root).sync()
+    elif args.action == 'import':
+        import_csv_tree(args.csv_root, get_store(args.store, args.root), date_range)
+    else:
+        export_csv_tree(get_store(args.store, args.root), args.csv_root, date_range)
@@ -0,0 +1,141 @@
+"""
+Fallback tier for article pages the direct download cannot get.
+
+A provider renders a URL remotely and returns its HTML: ScrappeyProvider calls the paid Scrappey
+API, LocalProvider answers from saved pages for tests and benchmarks. FallbackTier caps the
+renders one run may spend, and DomainRouter learns per publisher domain which tier works:
+domains where direct downloads keep failing go straight to the fallback, and domains where both
+keep failing are skipped until their statistics expire.
+"""
+import hashlib
+import os
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+FALLBACK_BUDGET = 500  # Fallback renders allowed per run
+MIN_ATTEMPTS = 3  # Outcomes seen on a tier before routing trusts them
+MIN_SUCCESS_RATE = 0.2  # A tier below this success rate counts as failing for the domain
+ROUTING_TTL = 7 * 24 * 3600  # Domain statistics older than this are discarded
+
+DIRECT, FALLBACK, SKIP = 'direct', 'fallback', 'skip'
+
+
+class FallbackBudgetExhausted(Exception):
+    pass
+
+
+class ScrappeyProvider:
+    name = 'scrappey'
+    API_URL = 'https://publisher.scrappey.com/api/v1?key={api_key}'
+
+    def __init__(self, api_key=None, timeout=60):
+        import requests
+        self.api_url = self.API_URL.format(api_key=api_key or os.environ.get('SCRAPPEY_API_KEY', '[your_api_key]'))
+        self.timeout = timeout
+        self.session = requests.Session()
+
+    def render(self, url):
+        response = self.session.post(self.api_url, headers={'Content-Type': 'application/json'},
+                                     json={'cmd': 'request.get', 'url': url}, timeout=self.timeout)
+        if response.status_code != 200:
+            raise ValueError(f"Scrappey API response error: {response.status_code}")
+        html = response.json().get('solution', {}).get('response', '')
+        if not html:
+            raise ValueError("Empty HTML returned from Scrappey")
+        return html
+
+
+def page_file_name(url):
+    return hashlib.sha256(url.encode('utf-8')).hexdigest() + '.html'
+
+
+class LocalProvider:
+    """
+    Stand-in provider: pages come from `pages` ({url: html}), then from `<sha256(url)>.html` files
+    in `pages_dir`, then `default`; unknown URLs fail like a render error. Latency and error rate
+    can be simulated as in local_lambda.
+    """
+    name = 'local'
+
+    def __init__(self, pages=None, pages_dir=None, default=None, latency=0.0, error_rate=0.0, seed=None):
+        self.pages = pages or {}
+        self.pages_dir = pages_dir
+        self.default = default
+        self.latency = latency
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.calls = []
+
+    def render(self, url):
+        with self.lock:
+            self.calls.append(url)
+            failed = self.random.random() < self.error_rate
+        if self.latency:
+            time.sleep(self.latency)
+        if failed:
+            raise ValueError("Simulated fallback error")
+        if url in self.pages:
+            return self.pages[url]
+        if self.pages_dir:
+            path = os.path.join(self.pages_dir, page_file_name(url))
+            if os.path.exists(path):
+                with open(path, 'r', encoding='utf-8') as f:
+                    return f.read()
+        if self.default is not None:
+            return self.default
+        raise ValueError(f"No local page for {url}")
+
+
+PROVIDERS = {'scrappey': ScrappeyProvider, 'local': LocalProvider}
+
+
+class FallbackTier:
+    def __init__(self, provider, budget=FALLBACK_BUDGET):
+        self.provider = provider
+        self.budget = budget
+        self.used = 0
+        self.lock = threading.Lock()
+
+    def render(self, url):
+        """One render of the URL; raises FallbackBudgetExhausted once the run's budget is spent"""
+        with self.lock:
+            if self.budget is not None and self.used >= self.budget:
+                raise FallbackBudgetExhausted(f"Fallback budget of {self.budget} renders spent")
+            self.used += 1
+        return self.provider.render(url)
+
+    def remaining(self):
+        with self.lock:
+            return None if self.budget is None else self.budget - self.used
+
+
+def url_domain(url):
+    domain = urlsplit(url).netloc.lower()
+    return domain[4:] if domain.startswith('www.') else domain
+
+
+class DomainRouter:
+    """Per-domain tier choice learned from outcomes recorded in the content cache"""
+    def __init__(self, cache, min_attempts=MIN_ATTEMPTS, min_success_rate=MIN_SUCCESS_RATE, ttl=ROUTING_TTL):
+        self.cache = cache
+        self.min_attempts = min_attempts
+        self.min_success_rate = min_success_rate
+        self.ttl = ttl
+
+    def failing(self, stats, tier):
+        if tier not in stats:
+            return False
+        attempts, successes, _ = stats[tier]
+        return attempts >= self.min_attempts and successes / attempts < self.min_success_rate
+
+    def route(self, url):
+        stats = self.cache.domain_stats(url_domain(url), time.time() - self.ttl)
+        if self.failing(stats, DIRECT):
+            return SKIP if self.failing(stats, FALLBACK) else FALLBACK
+        return DIRECT
+
+    def record(self, url, tier, ok):
+        self.cache.record_domain(url_domain(url), tier, ok, time.time() - self.ttl)
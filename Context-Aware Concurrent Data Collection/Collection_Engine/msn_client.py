@@ -0,0 +1,113 @@
+"""
+Client for the MSN content API that backs most Bing News results.
+
+An MSN article URL (`https://www.msn.com/en-us/news/politics/<slug>/ar-AA1abcd?ocid=...`)
+is reduced to its locale and article id, and the article JSON is fetched from
+`https://assets.msn.com/content/view/v2/Detail/<locale>/<id>` over one pooled session with
+retries. Many result URLs (different slugs, tracking parameters, sections) share an id, so
+`fetch_many` requests each (locale, id) once. The `body` HTML is reduced to text directly.
+"""
+import re
+from concurrent.futures import ThreadPoolExecutor
+from html.parser import HTMLParser
+from urllib.parse import urlsplit
+
+API_URL = 'https://assets.msn.com/content/view/v2/Detail/{locale}/{article_id}'
+DEFAULT_LOCALE = 'en-us'
+MAX_WORKERS = 16  # Concurrent API requests
+TIMEOUT = 10
+
+ARTICLE_ID = re.compile(r'/ar-([A-Za-z0-9]+)')
+LOCALE = re.compile(r'^[a-z]{2}-[a-z]{2}$')
+BLOCK_TAGS = {'p', 'div', 'br', 'li', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'blockquote', 'tr', 'section'}
+SKIP_TAGS = {'script', 'style', 'figcaption', 'figure'}
+
+
+def parse_msn_url(url):
+    """(locale, article id) of an MSN article URL, or None when it has no `/ar-` id"""
+    parts = urlsplit(url)
+    match = ARTICLE_ID.search(parts.path)
+    if not match:
+        return None
+    first_segment = parts.path.strip('/').split('/', 1)[0].lower()
+    return (first_segment if LOCALE.match(first_segment) else DEFAULT_LOCALE), match.group(1)
+
+
+def api_url(locale, article_id):
+    """Content API URL of an article: the same for every result URL pointing at it"""
+    return API_URL.format(locale=locale, article_id=article_id)
+
+
+class BodyText(HTMLParser):
+    """Text of the API's `body` HTML, one block per paragraph-level element"""
+    def __init__(self):
+        super().__init__()
+        self.parts = []
+        self.skip = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIP_TAGS:
+            self.skip += 1
+        elif tag in BLOCK_TAGS:
+            self.parts.append('\n')
+
+    def handle_endtag(self, tag):
+        if tag in SKIP_TAGS and self.skip:
+            self.skip -= 1
+        elif tag in BLOCK_TAGS:
+            self.parts.append('\n')
+
+    def handle_data(self, data):
+        if not self.skip:
+            self.parts.append(data)
+
+    def text(self):
+        return ''.join(self.parts)
+
+
+def body_text(body):
+    parser = BodyText()
+    parser.feed(body)
+    parser.close()
+    return parser.text()
+
+
+class MsnClient:
+    def __init__(self, max_workers=MAX_WORKERS, timeout=TIMEOUT, retries=3):
+        import requests
+        from urllib3.util.retry import Retry
+        self.timeout = timeout
+        self.max_workers = max_workers
+        self.session = requests.Session()
+        retry = Retry(total=retries, backoff_factor=2, status_forcelist=[429, 500, 502, 503, 504],
+                      allowed_methods=['GET'])
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=max_workers, max_retries=retry)
+        self.session.mount('https://', adapter)
+
+    def fetch(self, locale, article_id):
+        """Article body text for one id; raises on HTTP errors and responses without a body"""
+        response = self.session.get(api_url(locale, article_id), timeout=self.timeout)
+        response.raise_for_status()
+        data = response.json()
+        if 'body' not in data:
+            raise ValueError(f"No 'body' key in MSN response for {article_id}")
+        return body_text(data['body'])
+
+    def fetch_many(self, keys):
+        """Fetch distinct (locale, article id) keys concurrently; returns {key: text or the exception}"""
+        keys = list(dict.fromkeys(keys))
+        results = {}
+
+        def fetch_one(key):
+            try:
+                return key, self.fetch(*key)
+            except Exception as e:
+                return key, e
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='msn-api') as executor:
+            for key, result in executor.map(fetch_one, keys):
+                results[key] = result
+        return results
+
+    def close(self):
+        self.session.close()
@@ -0,0 +1,152 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import random
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+
+class RatePolicy:
+    """One request every `interval` seconds (plus up to `jitter`), with bursts of `capacity`"""
+    def __init__(self, interval, jitter=0.0, capacity=1):
+        self.interval = interval
+        self.jitter = jitter
+        self.capacity = capacity
+
+
+# Same politeness the collectors used to get from fixed sleeps:
+# 60-90 s between result pages, 15-20 s between search-history clicks
+DEFAULT_POLICIES = {
+    'page': RatePolicy(interval=60, jitter=30),
+    'interaction': RatePolicy(interval=15, jitter=5),
+}
+
+
+class TokenBucket:
+    def __init__(self, policy):
+        self.policy = policy
+        self.tokens = float(policy.capacity)
+        self.updated = time.monotonic()
+
+    def reserve(self):
+        """Consume a token and return the monotonic time at which the caller may send"""
+        now = time.monotonic()
+        if self.policy.interval <= 0:
+            return now  # Unthrottled (e.g. offline benchmarks)
+        self.tokens = min(self.policy.capacity, self.tokens + (now - self.updated) / self.policy.interval)
+        self.updated = now
+        self.tokens -= 1
+        if self.tokens >= 0:
+            return now
+
+        # Bucket is empty: queue behind earlier reservations and push the bucket back by the jitter too
+        delay = -self.tokens * self.policy.interval
+        if self.policy.jitter:
+            extra = random.uniform(0, self.policy.jitter)
+            self.tokens -= extra / self.policy.interval
+            delay += extra
+        return now + delay
+
+
+class RateScheduler:
+    """
+    Hands out request slots per egress identity, keyed by (engine, identity, kind).
+
+    acquire() blocks the calling thread until its slot, submit() queues work that runs on
+    the scheduler's worker pool once the slot is ready, so no worker sits idle in a sleep.
+    """
+    def __init__(self, policies=None, max_workers=60):
+        self.policies = dict(DEFAULT_POLICIES)
+        self.policies.update(policies or {})
+        self.buckets = {}
+        self.lock = threading.Lock()
+        self.max_workers = max_workers
+        self.executor = None
+        self.heap = []
+        self.counter = itertools.count()
+        self.condition = threading.Condition()
+        self.dispatcher = None
+
+    def set_policy(self, kind, policy):
+        with self.lock:
+            self.policies[kind] = policy
+            for key in [key for key in self.buckets if key[2] == kind]:
+                self.buckets[key].policy = policy
+
+    def reserve(self, engine, identity, kind='page'):
+        key = (engine, identity, kind)
+        with self.lock:
+            bucket = self.buckets.get(key)
+            if bucket is None:
+                bucket = self.buckets[key] = TokenBucket(self.policies[kind])
+            return bucket.reserve()
+
+    def acquire(self, engine, identity, kind='page'):
+        delay = self.reserve(engine, identity, kind) - time.monotonic()
+        if delay > 0:
+            logging.debug(f"Waiting {delay:.1f}s for {kind} slot: engine={engine}, identity={identity}")
+            time.sleep(delay)
+
+    async def acquire_async(self, engine, identity, kind='page'):
+        delay = self.reserve(engine, identity, kind) - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def submit(self, engine, identity, fn, *args, kind='page', **kwargs):
+        ready_at = self.reserve(engine, identity, kind)
+        future = Future()
+        with self.condition:
+            self.start()
+            heapq.heappush(self.heap, (ready_at, next(self.counter), future, fn, args, kwargs))
+            self.condition.notify()
+        return future
+
+    def call_soon(self, fn, *args, **kwargs):
+        """Run fn on the worker pool right away, without taking a rate slot"""
+        future = Future()
+        with self.condition:
+            self.start()
+        if future.set_running_or_notify_cancel():
+            self.executor.submit(self.run, future, fn, args, kwargs)
+        return future
+
+    def start(self):
+        if self.dispatcher is None:
+            self.executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='rate-worker')
+            self.dispatcher = threading.Thread(target=self.dispatch, name='rate-dispatcher', daemon=True)
+            self.dispatcher.start()
+
+    def dispatch(self):
+        while True:
+            with self.condition:
+                while not self.heap or self.heap[0][0] > time.monotonic():
+                    timeout = self.heap[0][0] - time.monotonic() if self.heap else None
+                    self.condition.wait(timeout)
+                _, _, future, fn, args, kwargs = heapq.heappop(self.heap)
+            if future.set_running_or_notify_cancel():
+                self.executor.submit(self.run, future, fn, args, kwargs)
+
+    @staticmethod
+    def run(future, fn, args, kwargs):
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+
+    def pending(self):
+        with self.condition:
+            return len(self.heap)
+
+
+_default_scheduler = None
+_default_scheduler_lock = threading.Lock()
+
+
+def get_scheduler():
+    global _default_scheduler
+    with _default_scheduler_lock:
+        if _default_scheduler is None:
+            _default_scheduler = RateScheduler()
+        return _default_scheduler
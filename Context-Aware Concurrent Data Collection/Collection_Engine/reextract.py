@@ -0,0 +1,97 @@
+"""
+Re-run SERP extraction over archived pages and rewrite the stored search results.
+
+    python Collection_Engine/reextract.py --start 2026-10-01 --end 2026-10-17
+
+Pages are grouped into the dataset partition they belong to (one per engine/context/topic/variant,
+or per search-history snapshot) and each group is extracted in a worker process, so selector fixes in
+serp_extractor.LAYOUTS can be applied to past collections in one batch job.
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from Serverless_Functions.serp_extractor import extract_results
+from Collection_Engine.serp_archive import get_archive, load_blob
+from Collection_Engine.specs import MAX_RESULTS
+from Collection_Engine.collector import ARCHIVE_DIR, write_results
+
+
+def output_variant(variant, scope):
+    """Same partitions the collector writes: snapshot scopes carry their term count"""
+    if scope.startswith('snapshot-'):
+        return f"{variant}_{scope.split('-', 1)[1]}"
+    return variant
+
+
+def group_entries(entries):
+    """{(date, engine, context, topic, variant, scope): [entry, ...] in page order}"""
+    groups = {}
+    for entry in entries:
+        key = (entry['created_date'], entry['engine'], entry['context'], entry['topic'], entry['variant'], entry['scope'])
+        groups.setdefault(key, []).append(entry)
+    for pages in groups.values():
+        pages.sort(key=lambda entry: entry['page'])
+    return groups
+
+
+def extract_group(archive_dir, csv_dir, key, pages, backend=None):
+    """Worker: extract one partition's pages and store them; returns (path, rows)"""
+    created_date, engine, context, topic, variant, scope = key
+    rows = []
+    for entry in pages:
+        for row in extract_results(load_blob(archive_dir, entry['digest']), entry['layout'], backend):
+            rows.append((entry['page'], len(rows) + 1) + tuple(row))
+            if len(rows) > MAX_RESULTS:
+                break
+        if len(rows) > MAX_RESULTS:
+            break
+
+    path = write_results(created_date, engine, context, topic, output_variant(variant, scope), rows, csv_dir)
+    return path, len(rows)
+
+
+def reextract(date_range, engines=None, contexts=None, archive_dir=ARCHIVE_DIR, csv_dir=None,
+              backend=None, max_workers=None):
+    entries = [entry for entry in get_archive(archive_dir).entries(date_range=date_range)
+               if (not engines or entry['engine'] in engines) and (not contexts or entry['context'] in contexts)]
+    groups = group_entries(entries)
+    logging.info(f"Re-extracting {len(entries)} archived pages into {len(groups)} files")
+
+    started = time.monotonic()
+    written = failed = 0
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(extract_group, archive_dir, csv_dir, key, pages, backend): key
+                   for key, pages in groups.items()}
+        for future in as_completed(futures):
+            try:
+                path, row_count = future.result()
+                written += 1
+                logging.info(f"Data saved to {path} ({row_count} rows)")
+            except Exception as e:
+                failed += 1
+                logging.error(f"Error re-extracting {futures[future]}: {str(e)}")
+
+    logging.info(f"Re-extraction finished in {time.monotonic() - started:.1f}s: {written} files written, {failed} failed")
+    return written, failed
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Re-run SERP extraction over the raw page archive")
+    parser.add_argument('--start', required=True, help="First collection date (YYYY-MM-DD)")
+    parser.add_argument('--end', help="Last collection date, defaults to --start")
+    parser.add_argument('--engines', nargs='+')
+    parser.add_argument('--contexts', nargs='+')
+    parser.add_argument('--archive', default=ARCHIVE_DIR)
+    parser.add_argument('--csv', help="Also write a legacy <date>/<engine>/<context>/ CSV tree under this root")
+    parser.add_argument('--backend', help="Extraction backend (selectolax, lxml, bs4); fastest installed by default")
+    parser.add_argument('--workers', type=int, help="Worker processes, defaults to the CPU count")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    reextract((args.start, args.end or args.start), args.engines, args.contexts,
+              args.archive, args.csv, args.backend, args.workers)
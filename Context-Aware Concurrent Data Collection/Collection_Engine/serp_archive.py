@@ -0,0 +1,157 @@
+"""
+Content-addressed archive of raw result pages.
+
+Every page body is stored once under its SHA-256 (`blobs/ab/abcdef....zst`) and an SQLite
+index maps (date, engine, context, topic, variant, scope, page) fetches to those blobs, so the
+extraction selectors can be re-run locally when a search engine changes its markup.
+"""
+import gzip
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+ZSTD_LEVEL = 10
+
+
+class ZstdCodec:
+    suffix = '.zst'
+
+    def __init__(self, level=ZSTD_LEVEL):
+        import zstandard
+        self.compressor = zstandard.ZstdCompressor(level=level)
+        self.decompressor = zstandard.ZstdDecompressor()
+        self.lock = threading.Lock()
+
+    def compress(self, data):
+        with self.lock:
+            return self.compressor.compress(data)
+
+    def decompress(self, data):
+        with self.lock:
+            return self.decompressor.decompress(data)
+
+
+class GzipCodec:
+    suffix = '.gz'
+
+    @staticmethod
+    def compress(data):
+        return gzip.compress(data)
+
+    @staticmethod
+    def decompress(data):
+        return gzip.decompress(data)
+
+
+CODECS = {'.zst': ZstdCodec, '.gz': GzipCodec}
+_codecs = {}
+
+
+def blob_path(root, digest, suffix):
+    return os.path.join(root, 'blobs', digest[:2], digest + suffix)
+
+
+def load_blob(root, digest):
+    """Read a page body straight from the blob store (safe in worker processes)"""
+    for suffix, codec in CODECS.items():
+        path = blob_path(root, digest, suffix)
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                data = f.read()
+            if suffix not in _codecs:
+                _codecs[suffix] = codec()
+            return _codecs[suffix].decompress(data).decode('utf-8')
+    raise KeyError(digest)
+
+
+def default_codec():
+    try:
+        return ZstdCodec()
+    except ImportError:
+        return GzipCodec()
+
+
+class SerpArchive:
+    def __init__(self, root, codec=None):
+        self.root = root
+        self.codec = codec or default_codec()
+        os.makedirs(os.path.join(root, 'blobs'), exist_ok=True)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(os.path.join(root, 'index.db'), check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("""CREATE TABLE IF NOT EXISTS pages (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            created_date TEXT, engine TEXT, context TEXT, topic TEXT, variant TEXT, scope TEXT,
+            page INTEGER, layout TEXT, digest TEXT, rows INTEGER, fetched_at REAL)""")
+        self.conn.execute("""CREATE INDEX IF NOT EXISTS pages_key
+            ON pages (created_date, engine, context, topic, variant, scope, page)""")
+
+    def blob_path(self, digest, suffix=None):
+        return blob_path(self.root, digest, suffix or self.codec.suffix)
+
+    def put(self, html):
+        """Store a page body; returns its digest. Identical bodies are written once"""
+        data = html.encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()
+        if any(os.path.exists(self.blob_path(digest, suffix)) for suffix in CODECS):
+            return digest
+        path = self.blob_path(digest)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(self.codec.compress(data))
+        os.replace(tmp_path, path)
+        return digest
+
+    def get(self, digest):
+        return load_blob(self.root, digest)
+
+    def record(self, created_date, engine, context, topic, variant, scope, page, layout, html, rows=None):
+        """Archive a fetched result page and index it; returns the digest"""
+        digest = self.put(html)
+        with self.lock:
+            self.conn.execute(
+                "INSERT INTO pages (created_date, engine, context, topic, variant, scope, page, layout, digest, rows, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (created_date, engine, context, topic, variant, scope, page, layout, digest, rows, time.time()))
+        return digest
+
+    def entries(self, created_date=None, engine=None, context=None, latest=True, date_range=None):
+        """
+        Index rows as dicts, optionally filtered by date (or inclusive (first, last) `date_range`),
+        engine and context; `latest` keeps only the last fetch of each page
+        """
+        filters = {'created_date': created_date, 'engine': engine, 'context': context}
+        where = [f"{column}=?" for column, value in filters.items() if value is not None]
+        params = [value for value in filters.values() if value is not None]
+        if date_range:
+            where.append("created_date BETWEEN ? AND ?")
+            params.extend(date_range)
+        query = "SELECT * FROM pages" + (" WHERE " + " AND ".join(where) if where else "")
+        if latest:
+            query = (f"SELECT * FROM ({query}) WHERE id IN (SELECT MAX(id) FROM pages "
+                     "GROUP BY created_date, engine, context, topic, variant, scope, page)")
+        query += " ORDER BY created_date, engine, context, topic, variant, scope, page"
+        with self.lock:
+            cursor = self.conn.execute(query, params)
+            columns = [column[0] for column in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+_archives = {}
+_archives_lock = threading.Lock()
+
+
+def get_archive(root):
+    root = os.path.abspath(root)
+    with _archives_lock:
+        if root not in _archives:
+            _archives[root] = SerpArchive(root)
+        return _archives[root]
@@ -0,0 +1,85 @@
+"""
+Declarative search engine and user context specs driving the unified collector.
+
+An engine spec says how to build a result-page request and where its config JSON files live
+(`<engine>/cookies.json`, `headers.json`, ...). A context spec says which variants to
+simulate, which headers/cookies each variant uses and how Lambda functions are assigned.
+"""
+
+REGIONS = ['us-west-1', 'us-east-2', 'ap-northeast-2', 'ap-northeast-1', 'eu-west-2', 'eu-west-3']
+
+ENGINES = {
+    'google_news': {
+        'url': 'https://www.google.com/search',
+        'params': {'tbm': 'nws'},
+        'offset_param': 'start',
+        'cookie_domain': 'google.com',
+        # Random combination of these cookies is sent when a context asks for cookie sampling
+        'cookie_subset': ['AEC', 'NID', 'DV'],
+        'history': {
+            'url': 'https://www.google.com/search',
+            'params': {},
+            'extract': None,  # organic results, parsed by google_history_links
+        },
+    },
+    'bing_news': {
+        'url': 'https://www.bing.com/news/search',
+        'params': {'FORM': 'HDRSC7'},
+        'offset_param': 'first',
+        'cookie_domain': 'bing.com',
+        'cookie_subset': None,
+        'history': {
+            'url': 'https://www.bing.com/news/search',
+            'params': {'FORM': 'HDRSC1'},
+            'extract': 'bing_news',
+        },
+    },
+}
+
+# 'headers_key' is a literal key of 'headers_file', or 'variant'/'perspective' to use the job's value.
+# 'functions' is 'round_robin' over the us-west-1 fleet or 'per_region' (one function per topic in each region).
+CONTEXTS = {
+    'accept_language': {
+        'variants': ["en-US", "ja-JP", "ko-KR", "fr-FR", "en-GB", "zh-CN"],
+        'headers_file': 'accept_language.json',
+        'headers_key': 'variant',
+        'cookies': 'neutral',
+        'sample_cookies': True,
+        'functions': 'round_robin',
+    },
+    'user_agent': {
+        'variants': ['Chrome-Windows', "Chrome-Android", "Safari-macOS", "Safari-iPhone", "Edge-Windows", "Edge-macOS"],
+        'headers_file': 'user_agent.json',
+        'headers_key': 'variant',
+        'cookies': 'neutral',
+        'sample_cookies': True,
+        'functions': 'round_robin',
+        'mobile_layouts': True,
+    },
+    'region': {
+        'variants': REGIONS,
+        'headers_file': 'accept_language.json',
+        'headers_key': 'en-US',
+        'cookies': 'neutral',
+        'sample_cookies': True,
+        # Regions whose requests carry a random subset of all cookies instead of the engine subset
+        'sample_all_cookies': ['eu-west-3', 'eu-west-2'],
+        'functions': 'per_region',
+    },
+    'search_history': {
+        'variants_file': 'search_history.csv',
+        'headers_file': 'headers.json',
+        'headers_key': 'perspective',
+        'cookies': 'perspective',
+        'sample_cookies': False,
+        'functions': 'round_robin',
+        'max_terms': 50,
+        'clicks_per_term': 5,
+        # Result pages are stored after these term indexes (files are suffixed with index + 1)
+        'snapshots': [9, 29, 49],
+    },
+}
+
+MAX_RESULTS = 50
+PAGE_SIZE = 10
+MAX_PAGE_ATTEMPTS = 5
@@ -1,4 +1,3 @@
-import boto3
 import botocore
 import configparser
 import json
@@ -11,91 +10,228 @@ import logging
 import shutil
 import tempfile
 import sys
-from threading import Lock
+from threading import BoundedSemaphore, Lock
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from Serverless_Functions.client_pool import get_lambda_client, get_s3_client
+
+POLL_INITIAL = 0.5  # First LastUpdateStatus poll, doubled up to POLL_MAX
+POLL_MAX = 10
+UPDATE_TIMEOUT = 300
+REGION_API_RATE = 5  # Lambda control-plane calls per second per region
+REGION_CONCURRENCY = 10  # Functions updated at once per region
+
+# The zip is read once per process and shared by every updater and deployment
+_package_cache = {}
+_package_lock = Lock()
+
+
+def load_package(path):
+    mtime = os.path.getmtime(path)
+    with _package_lock:
+        cached = _package_cache.get(path)
+        if cached is None or cached[0] != mtime:
+            with open(path, 'rb') as f:
+                cached = (mtime, f.read())
+            _package_cache[path] = cached
+        return cached[1]
+
+
+def wait_for_update(client, function_name, timeout=UPDATE_TIMEOUT, throttle=None):
+    """Poll LastUpdateStatus with exponential backoff; returns the final status"""
+    delay = POLL_INITIAL
+    deadline = time.monotonic() + timeout
+    while True:
+        time.sleep(delay)
+        if throttle:
+            throttle()
+        status = client.get_function(FunctionName=function_name)['Configuration']['LastUpdateStatus']
+        if status != 'InProgress' or time.monotonic() > deadline:
+            return status
+        delay = min(delay * 2, POLL_MAX)
+
+
+class RegionRateLimiter:
+    """Token bucket per region: `rate` calls per second with bursts of `rate`; acquire() blocks until a slot"""
+    def __init__(self, rate):
+        self.rate = rate
+        self.buckets = {}
+        self.lock = Lock()
+
+    def acquire(self, region):
+        with self.lock:
+            now = time.monotonic()
+            tokens, updated = self.buckets.get(region, (self.rate, now))
+            tokens = min(self.rate, tokens + (now - updated) * self.rate) - 1
+            self.buckets[region] = (tokens, now)
+        if tokens < 0:
+            time.sleep(-tokens / self.rate)
+
 
 class LambdaUpdater:
-    def __init__(self):
+    def __init__(self, deployment_package='deployment-package.zip'):
         self.current_dir = os.path.dirname(os.path.abspath(__file__))
-        self.deployment_package = 'deployment-package.zip'
-        self.update_lock = Lock()
+        self.deployment_package = deployment_package
+        # Updates of the same function are serialized, different functions update in parallel
+        self.update_locks = defaultdict(Lock)
+        self.locks_lock = Lock()
 
     def update_deployment_package(self):
-        # Read the updated zip file
-        with open(os.path.join(self.current_dir, self.deployment_package), 'rb') as f:
-            self.zipped_code = f.read()
-
-    def update_lambda_functions(self, region, functionName):
-        with self.update_lock:
-            session = boto3.session.Session()
-            client = session.client('lambda',
-                                    aws_access_key_id="",
-                                    aws_secret_access_key="",
-                                    region_name=region)
+        # Read the updated zip file (cached until it changes on disk)
+        self.zipped_code = load_package(os.path.join(self.current_dir, self.deployment_package))
+
+    def function_lock(self, function_name):
+        with self.locks_lock:
+            return self.update_locks[function_name]
+
+    def update_lambda_functions(self, region, functionName, code=None, throttle=None):
+        """
+        Deploy the package to one function; `code` overrides it (e.g. an S3 location). `throttle`
+        is called before every control-plane request (retries and status polls included). Returns success
+        """
+        with self.function_lock(functionName):
+            client = get_lambda_client(region)
+            if code is None:
+                self.update_deployment_package()
+                code = {'ZipFile': self.zipped_code}
             
             # Retry logic
             max_retries = 5
             for attempt in range(max_retries):
                 try:
-                    self.update_deployment_package()
-                    response = client.update_function_code(
-                        FunctionName=functionName,
-                        ZipFile=self.zipped_code
-                    )
-                    # print(region, functionName, "Update started", response)
-                    # Wait for update to be successful
-                    while True:
-                        time.sleep(1)
-                        response = client.get_function(FunctionName=functionName)
-                        # print(region, functionName, response['Configuration']['LastUpdateStatus'])
-                        if response['Configuration']['LastUpdateStatus'] == 'Successful':
-                            print(region, functionName, "Update successful")
-                            break
-                    break  # Exit the retry loop if successful
-                except Exception as e:
-                    if e.response['Error']['Code'] == 'ResourceConflictException' and attempt < max_retries - 1:
+                    if throttle:
+                        throttle()
+                    client.update_function_code(FunctionName=functionName, **code)
+                    status = wait_for_update(client, functionName, throttle=throttle)
+                    if status == 'Successful':
+                        logging.info(f"{region} {functionName} Update successful")
+                        return True
+                    logging.error(f"Update of {functionName} finished with status {status}")
+                    return False
+                except botocore.exceptions.ClientError as e:
+                    if e.response['Error']['Code'] in ('ResourceConflictException', 'TooManyRequestsException') and attempt < max_retries - 1:
                         logging.warning(f"Update in progress, retrying {functionName} (Attempt {attempt + 1}/{max_retries})")
-                        time.sleep(10)  # Wait before retrying
+                        time.sleep(min(POLL_INITIAL * 2 ** (attempt + 2), POLL_MAX))
                     else:
                         logging.error(f"Failed to update {functionName}: {e}")
-                        break
+                        return False
+                except Exception as e:
+                    logging.error(f"Failed to update {functionName}: {e}")
+                    return False
+            return False
     
+    def create_lambda_function(self, region, function_name, throttle=None):
+        client = get_lambda_client(region)
+        self.update_deployment_package()
+        try:
+            if throttle:
+                throttle()
+            # Create the Lambda function
+            response = client.create_function(
+                FunctionName=function_name,
+                Runtime='python3.10',  # Specify the runtime for the Lambda function
+                Role='arn:aws:iam::{id}:role/LambdaExecutionRole',  # Replace with your IAM role ARN
+                Handler='lambda_function.lambda_handler',  # Main function entry point
+                Code={
+                    'ZipFile': self.zipped_code
+                },
+                Timeout=120,  # Set function timeout as per your requirements
+                MemorySize=128,  # Set memory size (e.g., 128 MB)
+                Publish=True,
+                # Description=f'Lambda function {function_name}',
+                Architectures = ['arm64'],
+            )
+            print(f"Successfully created {function_name}")
+            return True
+        except botocore.exceptions.ClientError as e:
+            logging.error(f"Failed to create function {function_name}: {e}")
+            return False
+
     def create_lambda_functions(self, region, start_index, end_index):
-        session = boto3.session.Session()
-        client = session.client('lambda',
-                                aws_access_key_id="",
-                                aws_secret_access_key="",
-                                region_name=region)
-        
-        for i in range(start_index, end_index + 1):
-            function_name = f'scraper_{i}'
-            try:
-                # Create the Lambda function
-                response = client.create_function(
-                    FunctionName=function_name,
-                    Runtime='python3.10',  # Specify the runtime for the Lambda function
-                    Role='arn:aws:iam::{id}:role/LambdaExecutionRole',  # Replace with your IAM role ARN
-                    Handler='lambda_function.lambda_handler',  # Main function entry point
-                    Code={
-                        'ZipFile': self.zipped_code
-                    },
-                    Timeout=120,  # Set function timeout as per your requirements
-                    MemorySize=128,  # Set memory size (e.g., 128 MB)
-                    Publish=True,
-                    # Description=f'Lambda function {function_name}',
-                    Architectures = ['arm64'],
-                )
-                print(f"Successfully created {function_name}")
-            except botocore.exceptions.ClientError as e:
-                logging.error(f"Failed to create function {function_name}: {e}")
-            time.sleep(2)  # Optional: Add sleep to avoid overwhelming the API
+        names = [f'scraper_{i}' for i in range(start_index, end_index + 1)]
+        return FleetDeployer(self).run([(region, name) for name in names], action='create')
+
+
+class FleetDeployer:
+    """
+    Rolls the deployment package out to many functions at once.
+
+    Every region gets at most `region_concurrency` functions in flight and `api_rate`
+    API calls per second (every update, retry, status poll and S3 upload takes a token). With `s3_buckets` ({region: bucket}) the zip is uploaded
+    once per region and functions are pointed at the object; otherwise the cached bytes are sent.
+    """
+    def __init__(self, updater=None, max_workers=64, region_concurrency=REGION_CONCURRENCY,
+                 api_rate=REGION_API_RATE, s3_buckets=None, s3_key='deployment-package.zip'):
+        self.updater = updater or LambdaUpdater()
+        self.max_workers = max_workers
+        self.region_concurrency = region_concurrency
+        self.limiter = RegionRateLimiter(api_rate)
+        self.s3_buckets = s3_buckets or {}
+        self.s3_key = s3_key
+        self.region_slots = defaultdict(lambda: BoundedSemaphore(self.region_concurrency))
+        self.uploaded = {}
+        self.upload_locks = defaultdict(Lock)
+        self.lock = Lock()
+
+    def region_code(self, region, throttle=None):
+        """Code argument for update_function_code, uploading to the region's bucket on first use"""
+        bucket = self.s3_buckets.get(region)
+        if bucket is None:
+            return None
+        # Only deploys to the same region wait for its upload
+        with self.lock:
+            upload_lock = self.upload_locks[region]
+        with upload_lock:
+            if region not in self.uploaded:
+                self.updater.update_deployment_package()
+                if throttle:
+                    throttle()
+                get_s3_client(region).put_object(Bucket=bucket, Key=self.s3_key, Body=self.updater.zipped_code)
+                logging.info(f"Uploaded deployment package to s3://{bucket}/{self.s3_key}")
+                self.uploaded[region] = {'S3Bucket': bucket, 'S3Key': self.s3_key}
+            return self.uploaded[region]
+
+    def deploy_one(self, region, function_name, action):
+        with self.lock:
+            slots = self.region_slots[region]
+
+        def throttle():
+            self.limiter.acquire(region)
+
+        with slots:
+            if action == 'create':
+                return self.updater.create_lambda_function(region, function_name, throttle=throttle)
+            return self.updater.update_lambda_functions(region, function_name, code=self.region_code(region, throttle),
+                                                        throttle=throttle)
+
+    def run(self, targets, action='update'):
+        """Deploy to [(region, function)] concurrently; returns {region: Counter(succeeded, failed)}"""
+        targets = list(targets)
+        summary = defaultdict(Counter)
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(self.deploy_one, region, name, action): (region, name) for region, name in targets}
+            for done, future in enumerate(as_completed(futures), 1):
+                region, name = futures[future]
+                try:
+                    ok = future.result()
+                except Exception as e:
+                    logging.error(f"Failed to {action} {name}: {e}")
+                    ok = False
+                summary[region]['succeeded' if ok else 'failed'] += 1
+                if done % 50 == 0 or done == len(targets):
+                    logging.info(f"Deployment progress: {done}/{len(targets)} in {time.monotonic() - started:.0f}s")
+        for region, counts in summary.items():
+            logging.info(f"{region}: {counts['succeeded']} succeeded, {counts['failed']} failed")
+        return dict(summary)
 
 if __name__ == '__main__':
     current_dir = os.path.dirname(os.path.abspath(__file__))
     # Load AWS Lambda function information
     with open(os.path.join(current_dir, '../aws_functions.json')) as f:
         aws = json.load(f)
-    for region in aws:
-        # print(region, aws[region])
-        for function in aws[region]:
-            print(region, function['arn'])
-            LambdaUpdater().update_lambda_functions(region, function['arn'])
\ No newline at end of file
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    targets = [(region, function['arn']) for region in aws for function in aws[region]]
+    FleetDeployer().run(targets)
\ No newline at end of file
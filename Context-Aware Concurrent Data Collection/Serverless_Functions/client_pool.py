@@ -0,0 +1,80 @@
+import threading
+
+import boto3
+import botocore
+
+
+MAX_POOL_CONNECTIONS = 50  # Default keep-alive connections per client (per region)
+
+
+class LambdaClientPool:
+    """
+    Thread-safe cache of boto3 Lambda clients keyed by (region, config).
+
+    Clients are built once and shared by every collector thread and LambdaUpdater,
+    so the TLS connection pool behind each client stays warm across tasks. The S3 client
+    the deployer uploads packages with comes from the same pool (`service='s3'`).
+    """
+    def __init__(self, max_pool_connections=MAX_POOL_CONNECTIONS, region_pool_sizes=None):
+        self.max_pool_connections = max_pool_connections
+        self.region_pool_sizes = dict(region_pool_sizes or {})
+        self.session = boto3.session.Session()
+        self.clients = {}
+        self.lock = threading.Lock()
+
+    def set_region_pool_size(self, region, size):
+        with self.lock:
+            self.region_pool_sizes[region] = size
+            # Drop cached clients for the region so the new size applies on next use
+            for key in [key for key in self.clients if key[0] == region]:
+                del self.clients[key]
+
+    def pool_size(self, region):
+        return self.region_pool_sizes.get(region, self.max_pool_connections)
+
+    def client_config(self, region, read_timeout=100, connect_timeout=100, max_attempts=3):
+        return botocore.config.Config(
+            read_timeout=read_timeout,
+            connect_timeout=connect_timeout,
+            retries={"max_attempts": max_attempts},
+            max_pool_connections=self.pool_size(region),
+            tcp_keepalive=True
+        )
+
+    def get_client(self, region, read_timeout=100, connect_timeout=100, max_attempts=3, service='lambda'):
+        key = (region, read_timeout, connect_timeout, max_attempts, service)
+        with self.lock:
+            client = self.clients.get(key)
+            if client is None:
+                # boto3 sessions are not thread-safe, so clients are only created under the lock
+                client = self.session.client(service,
+                                             aws_access_key_id="",
+                                             aws_secret_access_key="",
+                                             config=self.client_config(region, read_timeout, connect_timeout, max_attempts),
+                                             region_name=region)
+                self.clients[key] = client
+            return client
+
+    def clear(self):
+        with self.lock:
+            self.clients.clear()
+
+
+_default_pool = None
+_default_pool_lock = threading.Lock()
+
+
+def get_client_pool():
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = LambdaClientPool()
+        return _default_pool
+
+
+def get_lambda_client(region, **config_options):
+    return get_client_pool().get_client(region, **config_options)
+
+
+def get_s3_client(region, **config_options):
+    return get_client_pool().get_client(region, service='s3', **config_options)
@@ -0,0 +1,85 @@
+import logging
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import botocore
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from Serverless_Functions.client_pool import get_client_pool
+
+ROTATION_INTERVAL = 120  # Minimum seconds between two rotations of the same function
+ROTATION_VARIABLE = 'IDENTITY_EPOCH'
+
+
+class IdentityRotator:
+    """
+    Gives a Lambda function a fresh execution environment (and usually a new egress IP)
+    by bumping an environment variable instead of re-uploading the deployment package.
+
+    rotate() returns immediately: the configuration update runs on a small background pool,
+    and requests for a function that is already rotating or was rotated within `min_interval`
+    are dropped, so one blocked ARN never holds up collector workers.
+    """
+    def __init__(self, min_interval=ROTATION_INTERVAL, max_workers=8, client_pool=None):
+        self.min_interval = min_interval
+        self.client_pool = client_pool or get_client_pool()
+        self.last_rotated = {}
+        self.pending = {}
+        self.lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='identity-rotator')
+
+    def rotate(self, region, arn):
+        """Schedule a rotation; returns False when rate-limited or already in progress"""
+        now = time.monotonic()
+        with self.lock:
+            future = self.pending.get(arn)
+            if future is not None and not future.done():
+                return False
+            if now - self.last_rotated.get(arn, float('-inf')) < self.min_interval:
+                return False
+            self.last_rotated[arn] = now
+            self.pending[arn] = self.executor.submit(self.bump_environment, region, arn)
+        return True
+
+    def is_rotating(self, arn):
+        with self.lock:
+            future = self.pending.get(arn)
+            return future is not None and not future.done()
+
+    def bump_environment(self, region, arn):
+        client = self.client_pool.get_client(region)
+        try:
+            config = client.get_function_configuration(FunctionName=arn)
+            variables = dict(config.get('Environment', {}).get('Variables', {}))
+            variables[ROTATION_VARIABLE] = str(time.time_ns())
+            client.update_function_configuration(FunctionName=arn, Environment={'Variables': variables})
+            logging.info(f"Rotated identity of {arn}")
+        except botocore.exceptions.ClientError as e:
+            # ResourceConflictException: a deployment or earlier rotation is still in progress
+            logging.warning(f"Failed to rotate {arn}: {e}")
+        except Exception as e:
+            logging.error(f"Failed to rotate {arn}: {e}")
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+
+
+_default_rotator = None
+_default_rotator_lock = threading.Lock()
+
+
+def get_rotator():
+    global _default_rotator
+    with _default_rotator_lock:
+        if _default_rotator is None:
+            _default_rotator = IdentityRotator()
+        return _default_rotator
+
+
+def set_rotator(rotator):
+    global _default_rotator
+    with _default_rotator_lock:
+        _default_rotator = rotator
@@ -1,8 +1,97 @@
 import json
+import os
+import threading
+import time
 import requests
+from requests.adapters import HTTPAdapter
 from requests.exceptions import RequestException
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
 import json 
 
+try:
+    from serp_extractor import LAYOUTS, compress_body, extract_results
+except ImportError:
+    from Serverless_Functions.serp_extractor import LAYOUTS, compress_body, extract_results
+
+CONNECT_TIMEOUT = float(os.environ.get('CONNECT_TIMEOUT', 10))
+READ_TIMEOUT = float(os.environ.get('READ_TIMEOUT', 60))
+
+# Time spent opening a new connection during the current request (0 when a pooled one was reused)
+timing = threading.local()
+
+class TimedHTTPConnection(HTTPConnection):
+    def connect(self):
+        start = time.perf_counter()
+        super().connect()
+        timing.connect += time.perf_counter() - start
+
+class TimedHTTPSConnection(HTTPSConnection):
+    def connect(self):
+        start = time.perf_counter()
+        super().connect()
+        timing.connect += time.perf_counter() - start
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+class TimedHTTPAdapter(HTTPAdapter):
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {'http': TimedHTTPConnectionPool, 'https': TimedHTTPSConnectionPool}
+
+def build_session():
+    session = requests.Session()
+    adapter = TimedHTTPAdapter(pool_connections=4, pool_maxsize=4)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+# Lives for the lifetime of the container, so warm invocations skip DNS, TCP and TLS setup
+session = build_session()
+
+def fetch(url, params, cookies, headers, timeout):
+    """GET through the shared session; returns (response, text, timing metadata in ms)"""
+    timing.connect = 0.0
+    # Persona cookies are sent per request and never kept in the shared jar
+    session.cookies.clear()
+    try:
+        start = time.perf_counter()
+        response = session.get(url,
+                               params=params,
+                               cookies=cookies,
+                               headers=headers,
+                               timeout=timeout,
+                               stream=True)
+        ttfb = time.perf_counter() - start
+        text = response.text
+        total = time.perf_counter() - start
+    finally:
+        session.cookies.clear()
+    return response, text, {
+        'connect_ms': round(timing.connect * 1000, 1),
+        'ttfb_ms': round(ttfb * 1000, 1),
+        'total_ms': round(total * 1000, 1),
+        'reused_connection': timing.connect == 0.0,
+    }
+
+def build_result(event, text):
+    # Optional extract mode: parse here and return compact rows instead of the full HTML
+    layout_name = event.get('extract')
+    if layout_name not in LAYOUTS:
+        return {'statusCode': 200, 'body': text}
+    try:
+        rows = extract_results(text, layout_name)
+    except ImportError:
+        return {'statusCode': 200, 'body': text}
+    result = {'statusCode': 200, 'rows': rows}
+    if event.get('raw'):
+        result['body_gz'] = compress_body(text)
+    return result
+
 def lambda_handler(event, context):
     try:
         cookies = event['cookies']
@@ -11,23 +100,20 @@ def lambda_handler(event, context):
         url = event['url']
         
         
-        response = requests.get(url, 
-                            params=params, 
-                            cookies=cookies, 
-                            headers=headers)
+        timeout = (event.get('connect_timeout', CONNECT_TIMEOUT), event.get('read_timeout', READ_TIMEOUT))
+        response, text, request_timing = fetch(url, params, cookies, headers, timeout)
         
         # Check if response is successful
         if response.status_code == 200:
-            return {
-                'statusCode': 200,
-                'body': response.text
-            }
+            result = build_result(event, text)
         else:
             # Handle non-200 responses
-            return {
+            result = {
                 'statusCode': response.status_code,
-                'body': f"Error: Received status code {response.text}"
+                'body': f"Error: Received status code {text}"
             }
+        result['timing'] = request_timing
+        return result
     except RequestException as e:
         # Handle exceptions raised by requests.get
         return {'statusCode': 500, 'body': f"Error: {str(e)}"}
\ No newline at end of file
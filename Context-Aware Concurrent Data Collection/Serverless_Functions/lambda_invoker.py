@@ -0,0 +1,184 @@
+import asyncio
+import json
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from Serverless_Functions.client_pool import get_client_pool
+
+
+MAX_IN_FLIGHT = 1000  # Concurrent invocations allowed on the shared event loop
+MAX_RETRIES = 5
+
+
+class Boto3Transport:
+    """Fallback transport: blocking boto3 invokes run on a private thread pool"""
+    def __init__(self, max_workers=64, client_pool=None):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='lambda-invoke')
+        self.client_pool = client_pool or get_client_pool()
+
+    def invoke_blocking(self, region, arn, payload):
+        response = self.client_pool.get_client(region).invoke(FunctionName=arn, Payload=payload, InvocationType="RequestResponse")
+        return json.loads(response['Payload'].read().decode('utf-8'))
+
+    async def invoke(self, region, arn, payload):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self.invoke_blocking, region, arn, payload)
+
+    async def close(self):
+        self.executor.shutdown(wait=False)
+
+
+class AioBotocoreTransport:
+    """Native async transport: one aiobotocore client per region, shared by every coroutine"""
+    def __init__(self, client_pool=None):
+        from aiobotocore.session import get_session
+        self.session = get_session()
+        self.client_pool = client_pool or get_client_pool()
+        self.clients = {}
+        self.client_contexts = {}
+        self.clients_lock = None
+
+    async def get_client(self, region):
+        if self.clients_lock is None:
+            self.clients_lock = asyncio.Lock()
+        async with self.clients_lock:
+            if region not in self.clients:
+                context = self.session.create_client('lambda',
+                                                     aws_access_key_id="",
+                                                     aws_secret_access_key="",
+                                                     config=self.client_pool.client_config(region),
+                                                     region_name=region)
+                self.clients[region] = await context.__aenter__()
+                self.client_contexts[region] = context
+            return self.clients[region]
+
+    async def invoke(self, region, arn, payload):
+        client = await self.get_client(region)
+        response = await client.invoke(FunctionName=arn, Payload=payload, InvocationType="RequestResponse")
+        async with response['Payload'] as stream:
+            body = await stream.read()
+        return json.loads(body.decode('utf-8'))
+
+    async def close(self):
+        for context in self.client_contexts.values():
+            await context.__aexit__(None, None, None)
+        self.clients.clear()
+        self.client_contexts.clear()
+
+
+def default_transport():
+    try:
+        return AioBotocoreTransport()
+    except ImportError:
+        logging.info("aiobotocore not installed, falling back to threaded boto3 transport")
+        return Boto3Transport()
+
+
+class LambdaInvoker:
+    """
+    Drives Lambda invocations for every collector from a single event loop.
+
+    Coroutines can await invoke()/invoke_many() directly. Threaded callers use invoke_async(),
+    which schedules onto the invoker's background loop and returns a concurrent Future, so the
+    calling thread is free while the call is in flight; invoke_sync() waits on that Future.
+    """
+    def __init__(self, transport=None, max_in_flight=MAX_IN_FLIGHT, max_retries=MAX_RETRIES):
+        self.transport = transport
+        self.max_in_flight = max_in_flight
+        self.max_retries = max_retries
+        self.semaphore = None
+        self.loop = None
+        self.thread = None
+        self.start_lock = threading.Lock()
+        self.latency = {}
+        self.latency_lock = threading.Lock()
+
+    def record_timing(self, region, timing):
+        """Accumulate the timing metadata the scraper returns with each invocation"""
+        with self.latency_lock:
+            stats = self.latency.setdefault(region, {'count': 0, 'connect_ms': 0.0, 'ttfb_ms': 0.0, 'total_ms': 0.0, 'reused': 0})
+            stats['count'] += 1
+            for key in ('connect_ms', 'ttfb_ms', 'total_ms'):
+                stats[key] += timing.get(key, 0.0)
+            stats['reused'] += 1 if timing.get('reused_connection') else 0
+
+    def latency_summary(self):
+        """Average connect/TTFB/total milliseconds and connection reuse rate per region"""
+        with self.latency_lock:
+            return {
+                region: {
+                    'count': stats['count'],
+                    'connect_ms': stats['connect_ms'] / stats['count'],
+                    'ttfb_ms': stats['ttfb_ms'] / stats['count'],
+                    'total_ms': stats['total_ms'] / stats['count'],
+                    'reuse_rate': stats['reused'] / stats['count'],
+                }
+                for region, stats in self.latency.items()
+            }
+
+    async def invoke(self, region, arn, payload):
+        if self.transport is None:
+            self.transport = default_transport()
+        if self.semaphore is None:
+            self.semaphore = asyncio.Semaphore(self.max_in_flight)
+
+        async with self.semaphore:
+            for attempt in range(self.max_retries):
+                try:
+                    result = await self.transport.invoke(region, arn, payload)
+                    if isinstance(result, dict) and 'timing' in result:
+                        self.record_timing(region, result['timing'])
+                    return result
+                except Exception as e:
+                    logging.error(f"Error invoking Lambda function ARN: {arn} (attempt {attempt+1}/{self.max_retries}): {str(e)}")
+                    if attempt == self.max_retries - 1:
+                        raise
+                    await asyncio.sleep(2 ** attempt)  # Exponential backoff
+
+    async def invoke_many(self, requests):
+        """Invoke (region, arn, payload) tuples concurrently; failures are returned as exceptions"""
+        return await asyncio.gather(*(self.invoke(region, arn, payload) for region, arn, payload in requests),
+                                    return_exceptions=True)
+
+    def start(self):
+        with self.start_lock:
+            if self.loop is None:
+                self.loop = asyncio.new_event_loop()
+                self.thread = threading.Thread(target=self.loop.run_forever, name='lambda-invoker', daemon=True)
+                self.thread.start()
+        return self.loop
+
+    def invoke_async(self, region, arn, payload):
+        return asyncio.run_coroutine_threadsafe(self.invoke(region, arn, payload), self.start())
+
+    def invoke_sync(self, region, arn, payload, timeout=None):
+        return self.invoke_async(region, arn, payload).result(timeout)
+
+    def close(self):
+        if self.loop is None:
+            return
+        if self.transport is not None:
+            asyncio.run_coroutine_threadsafe(self.transport.close(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+        self.loop = None
+
+
+_default_invoker = None
+_default_invoker_lock = threading.Lock()
+
+
+def get_invoker():
+    global _default_invoker
+    with _default_invoker_lock:
+        if _default_invoker is None:
+            _default_invoker = LambdaInvoker()
+        return _default_invoker
+
+
+def set_invoker(invoker):
+    global _default_invoker
+    with _default_invoker_lock:
+        _default_invoker = invoker
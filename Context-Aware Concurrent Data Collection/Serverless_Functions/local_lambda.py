@@ -0,0 +1,145 @@
+"""
+Local stand-in for the Lambda fleet, for running and benchmarking collectors without AWS.
+
+LocalLambdaClient implements the parts of the boto3 Lambda client the collection tier uses
+(invoke, get_function_configuration, update_function_configuration). In 'fixtures' mode it
+answers from saved result pages (named `<layout>__<anything>.html`, as for the extractor
+benchmark) through the real lambda_function.build_result, so extract/raw modes behave as in
+production. In 'handler' mode it runs lambda_function.lambda_handler in-process (real HTTP), with
+the module's shared session swapped for one session per invoking thread, the way every Lambda
+container has its own.
+"""
+import io
+import json
+import os
+import random
+import sys
+import threading
+import time
+from urllib.parse import urlparse
+
+import botocore
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from Serverless_Functions import lambda_function
+from Serverless_Functions.lambda_invoker import Boto3Transport, LambdaInvoker, set_invoker
+from Serverless_Functions.identity_rotator import IdentityRotator, set_rotator
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_FIXTURES_DIR = os.path.join(current_dir, '../Collection_Engine/benchmarks/fixtures')
+
+
+def load_fixtures(fixtures_dir):
+    """{layout: [html, ...]} from `<layout>__<anything>.html` files"""
+    fixtures = {}
+    for file_name in sorted(os.listdir(fixtures_dir)):
+        if file_name.endswith('.html') and '__' in file_name:
+            with open(os.path.join(fixtures_dir, file_name), 'r', encoding='utf-8') as f:
+                fixtures.setdefault(file_name.split('__')[0], []).append(f.read())
+    return fixtures
+
+
+def google_history_page(results=10):
+    """Synthetic organic Google result page with click-tracking links"""
+    blocks = []
+    for i in range(results):
+        blocks.append(
+            f'<div class="MjjYud"><h3 class="LC20lb MBeuO DKV0Md">Result {i}</h3>'
+            f'<div class="kb0PBd cvP2Ce jGGQ5e"><div><div><span>'
+            f'<a href="https://example.com/{i}" ping="/url?sa=t&url=https://example.com/{i}">link</a>'
+            f'</span></div></div></div></div>')
+    return f"<html><body>{''.join(blocks)}</body></html>"
+
+
+class ThreadLocalSession:
+    """
+    Drop-in for lambda_function.session: lambda_handler clears and refills the session's cookie
+    jar per call, so concurrent in-process calls must not share one
+    """
+    def __init__(self):
+        self.local = threading.local()
+
+    def __getattr__(self, name):
+        session = getattr(self.local, 'session', None)
+        if session is None:
+            session = self.local.session = lambda_function.build_session()
+        return getattr(session, name)
+
+
+class LocalLambdaClient:
+    def __init__(self, mode='fixtures', fixtures_dir=DEFAULT_FIXTURES_DIR, latency=1.0, latency_jitter=0.5,
+                 error_rate=0.0, empty_rate=0.0, seed=None):
+        self.mode = mode
+        if mode == 'handler' and not isinstance(lambda_function.session, ThreadLocalSession):
+            lambda_function.session = ThreadLocalSession()
+        self.fixtures = load_fixtures(fixtures_dir) if mode == 'fixtures' else {}
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.error_rate = error_rate
+        self.empty_rate = empty_rate
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.invocations = 0
+        self.rotations = 0
+
+    def chance(self, rate):
+        with self.lock:
+            return self.random.random() < rate
+
+    def fixture_page(self, event):
+        layout_name = event.get('extract')
+        if layout_name in self.fixtures:
+            with self.lock:
+                return self.random.choice(self.fixtures[layout_name])
+        if urlparse(event['url']).netloc.endswith('google.com'):
+            return google_history_page()
+        return "<html><body>OK</body></html>"
+
+    def respond(self, event):
+        if self.mode == 'handler':
+            return lambda_function.lambda_handler(event, None)
+        if self.chance(self.empty_rate):
+            text = "<html><body></body></html>"
+        else:
+            text = self.fixture_page(event)
+        result = lambda_function.build_result(event, text)
+        total_ms = round(self.latency * 1000, 1)
+        result['timing'] = {'connect_ms': 0.0, 'ttfb_ms': total_ms, 'total_ms': total_ms, 'reused_connection': True}
+        return result
+
+    def invoke(self, FunctionName, Payload, InvocationType='RequestResponse'):
+        with self.lock:
+            self.invocations += 1
+            delay = self.latency + self.random.uniform(0, self.latency_jitter)
+        time.sleep(delay)
+        if self.chance(self.error_rate):
+            raise botocore.exceptions.ClientError(
+                {'Error': {'Code': 'TooManyRequestsException', 'Message': 'Injected error'}}, 'Invoke')
+        body = json.dumps(self.respond(json.loads(Payload))).encode('utf-8')
+        return {'StatusCode': 200, 'Payload': io.BytesIO(body)}
+
+    def get_function_configuration(self, FunctionName):
+        return {'FunctionName': FunctionName, 'Environment': {'Variables': {}}}
+
+    def update_function_configuration(self, FunctionName, Environment):
+        with self.lock:
+            self.rotations += 1
+        return {'FunctionName': FunctionName, 'LastUpdateStatus': 'Successful'}
+
+
+class LocalClientPool:
+    """Client-pool stand-in handing the same local client out for every region"""
+    def __init__(self, client):
+        self.client = client
+
+    def get_client(self, region, **options):
+        return self.client
+
+
+def use_local_lambda(max_workers=64, **options):
+    """Route every collector invocation and identity rotation to a LocalLambdaClient; returns it"""
+    client = LocalLambdaClient(**options)
+    pool = LocalClientPool(client)
+    set_invoker(LambdaInvoker(Boto3Transport(max_workers=max_workers, client_pool=pool), max_retries=3))
+    set_rotator(IdentityRotator(client_pool=pool))
+    return client
@@ -0,0 +1,270 @@
+"""
+SERP result extraction shared by the collectors and the Lambda scraper.
+
+Every backend yields the same (source, title, content, url) tuples. Class selectors follow
+BeautifulSoup's class_ semantics: a single class matches any element carrying that class,
+a space-separated string must equal the whole class attribute after whitespace is collapsed
+(same classes in the same order). Text leaves out <script> and <style> contents, as bs4 does.
+"""
+import base64
+import gzip
+import logging
+
+
+# tag/class selectors per result layout; 'results' lists fallbacks tried in order
+LAYOUTS = {
+    'google_news': {
+        'results': [('div', 'SoaBEf'), ('div', 'W0kfrc')],
+        'source': ('div', 'MgUUmf NUnG9d'),
+        'title': ('div', 'n0jPhd ynAwRc MBeuO nDgy9d'),
+        'content': ('div', 'GI74Re nDgy9d'),
+        'url': ('a', 'WlydOe'),
+        'strip_title_newlines': True,
+    },
+    'google_news_mobile': {
+        'results': [('div', 'Ww4FFb vt6azd')],
+        'source': ('div', 'MgUUmf NUnG9d'),
+        'title': ('div', 'n0jPhd ynAwRc tNxQIb nDgy9d'),
+        'content': ('div', 'GI74Re nDgy9d'),
+        'url': ('a', 'WlydOe'),
+        'strip_title_newlines': True,
+    },
+    'bing_news': {
+        'results': [('div', 'news-card newsitem cardcommon')],
+        'source': ('div', 'tptt'),
+        'title': ('a', 'title'),
+        'content': ('div', 'snippet'),
+        'url': ('a', 'title'),
+        'strip_title_newlines': False,
+    },
+    'bing_news_mobile': {
+        'results': [('div', 'newscard vr')],
+        'source': None,
+        'title': ('a', 'title'),
+        'content': None,
+        'url': ('a', 'title'),
+        'strip_title_newlines': False,
+    },
+}
+
+MOBILE_USER_AGENTS = ['Chrome-Android', 'Safari-iPhone']
+NON_TEXT_TAGS = ('script', 'style')
+
+
+def layout_for(engine, user_agent=None):
+    if user_agent in MOBILE_USER_AGENTS:
+        return f"{engine}_mobile"
+    return engine
+
+
+def build_row(layout, source, title, content, url):
+    if layout['source'] is not None:
+        source = source.strip() if source is not None else ""
+    if title is None:
+        title = 'Title Not Found'
+    elif layout['strip_title_newlines']:
+        title = title.replace("\n", "").strip()
+    else:
+        title = title.strip()
+    if layout['content'] is not None:
+        content = content.replace("\n", "").strip() if content is not None else ""
+    return source, title, content, url if url is not None else ""
+
+
+class BeautifulSoupBackend:
+    """Reference implementation, identical to the original collector code"""
+    name = 'bs4'
+
+    def __init__(self, parser='html.parser'):
+        from bs4 import BeautifulSoup
+        self.BeautifulSoup = BeautifulSoup
+        self.parser = parser
+
+    def text(self, result, selector):
+        if selector is None:
+            return None
+        node = result.find(selector[0], class_=selector[1])
+        return node.text if node else None
+
+    def extract(self, html, layout):
+        soup = self.BeautifulSoup(html, self.parser)
+        for tag, class_name in layout['results']:
+            results = soup.find_all(tag, class_=class_name)
+            if results:
+                break
+        rows = []
+        for result in results:
+            url_block = result.find(layout['url'][0], class_=layout['url'][1])
+            rows.append(build_row(layout,
+                                  self.text(result, layout['source']),
+                                  self.text(result, layout['title']),
+                                  self.text(result, layout['content']),
+                                  url_block.get('href') if url_block else None))
+        return rows
+
+
+class LxmlBackend:
+    name = 'lxml'
+
+    def __init__(self):
+        import lxml.etree
+        import lxml.html
+        self.lxml_etree = lxml.etree
+        self.lxml_html = lxml.html
+
+    @staticmethod
+    def xpath(selector):
+        tag, class_name = selector
+        if ' ' in class_name:
+            return f".//{tag}[normalize-space(@class)='{' '.join(class_name.split())}']"
+        return f".//{tag}[contains(concat(' ', normalize-space(@class), ' '), ' {class_name} ')]"
+
+    def first(self, result, selector):
+        if selector is None:
+            return None
+        nodes = result.xpath(self.xpath(selector))
+        return nodes[0] if nodes else None
+
+    def text(self, result, selector):
+        node = self.first(result, selector)
+        return ''.join(node.itertext()) if node is not None else None
+
+    def extract(self, html, layout):
+        if not html or not html.strip():
+            return []
+        root = self.lxml_html.fromstring(html)
+        self.lxml_etree.strip_elements(root, *NON_TEXT_TAGS, with_tail=False)
+        for selector in layout['results']:
+            results = root.xpath(self.xpath(selector))
+            if results:
+                break
+        rows = []
+        for result in results:
+            url_block = self.first(result, layout['url'])
+            rows.append(build_row(layout,
+                                  self.text(result, layout['source']),
+                                  self.text(result, layout['title']),
+                                  self.text(result, layout['content']),
+                                  url_block.get('href') if url_block is not None else None))
+        return rows
+
+
+class SelectolaxBackend:
+    name = 'selectolax'
+
+    def __init__(self):
+        try:
+            from selectolax.lexbor import LexborHTMLParser as HTMLParser
+        except ImportError:
+            from selectolax.parser import HTMLParser
+        self.HTMLParser = HTMLParser
+
+    @staticmethod
+    def css(selector):
+        tag, class_name = selector
+        return tag + ''.join(f'.{name}' for name in class_name.split())
+
+    @staticmethod
+    def select(node, selector):
+        """Elements matching the selector; multi-class selectors must equal the collapsed class attribute"""
+        nodes = node.css(SelectolaxBackend.css(selector))
+        if ' ' not in selector[1]:
+            return nodes
+        class_name = ' '.join(selector[1].split())
+        return [found for found in nodes if ' '.join((found.attributes.get('class') or '').split()) == class_name]
+
+    def first(self, result, selector):
+        if selector is None:
+            return None
+        if ' ' not in selector[1]:
+            return result.css_first(self.css(selector))
+        nodes = self.select(result, selector)
+        return nodes[0] if nodes else None
+
+    def text(self, result, selector):
+        node = self.first(result, selector)
+        return node.text() if node is not None else None
+
+    def extract(self, html, layout):
+        tree = self.HTMLParser(html or '')
+        tree.strip_tags(list(NON_TEXT_TAGS))
+        for selector in layout['results']:
+            results = self.select(tree, selector)
+            if results:
+                break
+        rows = []
+        for result in results:
+            url_block = self.first(result, layout['url'])
+            rows.append(build_row(layout,
+                                  self.text(result, layout['source']),
+                                  self.text(result, layout['title']),
+                                  self.text(result, layout['content']),
+                                  url_block.attributes.get('href') if url_block is not None else None))
+        return rows
+
+
+BACKENDS = {
+    'selectolax': SelectolaxBackend,
+    'lxml': LxmlBackend,
+    'bs4': BeautifulSoupBackend,
+}
+
+_backends = {}
+
+
+def get_backend(name=None):
+    """Return the named backend, or the fastest one that is installed"""
+    names = [name] if name else list(BACKENDS)
+    for backend_name in names:
+        if backend_name not in _backends:
+            try:
+                _backends[backend_name] = BACKENDS[backend_name]()
+            except ImportError:
+                if name:
+                    raise
+                logging.debug(f"SERP backend {backend_name} not installed")
+                continue
+        return _backends[backend_name]
+    raise ImportError("No SERP extraction backend installed (selectolax, lxml or beautifulsoup4)")
+
+
+def extract_results(html, layout_name, backend=None):
+    """Parse a result page into a list of (source, title, content, url) tuples"""
+    return get_backend(backend).extract(html, LAYOUTS[layout_name])
+
+
+def rows_from_response(response, layout_name, backend=None):
+    """Rows extracted inside Lambda when the response carries them, otherwise parsed here"""
+    if 'rows' in response:
+        return [tuple(row) for row in response['rows']]
+    return extract_results(response_body(response), layout_name, backend)
+
+
+def google_history_links(html, limit=5):
+    """(title, click url) pairs of the top organic Google results, used to simulate clicks"""
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(html, 'html.parser')
+    links = []
+    for result in soup.find_all('div', class_='MjjYud')[:limit]:
+        title = result.find('h3', class_='LC20lb MBeuO DKV0Md')
+        title = title.text.replace("\n", "").strip() if title else 'Title Not Found'
+        url_block = result.select('div.kb0PBd.cvP2Ce.jGGQ5e > div > div > span > a')
+        url_ping = url_block[0].get('ping') if url_block else None
+        if url_ping:
+            links.append((title, f"https://www.google.com{url_ping}"))
+    return links
+
+
+def compress_body(text):
+    return base64.b64encode(gzip.compress(text.encode('utf-8'))).decode('ascii')
+
+
+def decompress_body(data):
+    return gzip.decompress(base64.b64decode(data)).decode('utf-8')
+
+
+def response_body(response):
+    """Raw page HTML from a Lambda response, whether sent plain or compressed"""
+    if 'body_gz' in response:
+        return decompress_body(response['body_gz'])
+    return response.get('body', '')
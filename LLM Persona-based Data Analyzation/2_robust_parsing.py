@@ -1,14 +1,15 @@
-import os, json, re
+import os, json, re, sys
 import pandas as pd
-from datetime import datetime
 from claude.claude_request import Claude
 from chatgpt.chatgpt_request import ChatGPT
 
 current_dir = os.path.dirname(os.path.abspath(__file__))
 setting_date = '0921-30'
-datasets_file_path = os.path.join(current_dir, f'../result_folder/results_{setting_date}')
-results_file_path = os.path.join(current_dir, f'../result_folder/results_{setting_date}')
-datetime_folders = [folder for folder in os.listdir(datasets_file_path) if os.path.isdir(os.path.join(datasets_file_path, folder))]
+sys.path.append(os.path.join(current_dir, '../Context-Aware Concurrent Data Collection'))
+from Collection_Engine.dataset_store import get_store
+
+results_store = get_store(f'results_{setting_date}')
+parsing_store = get_store(f'parsed_{setting_date}')
 
 def get_model_persona_columns(df, model_version_list):
     """Get all columns that correspond to model versions with personas"""
@@ -22,74 +23,46 @@ def get_model_persona_columns(df, model_version_list):
     return columns
 
 def get_df(datetime_range, claude_model_version_list, chatgpt_model_version_list):
-    start_date = datetime.strptime(datetime_range[0], "%Y-%m-%d")
-    end_date = datetime.strptime(datetime_range[1], "%Y-%m-%d")
-    
-    datetime_folders = sorted([folder for folder in os.listdir(datasets_file_path) if os.path.isdir(os.path.join(datasets_file_path, folder))])
-    for datetime_folder in datetime_folders:
-        folder_date = datetime.strptime(datetime_folder, "%Y-%m-%d")
-        if folder_date < start_date or folder_date > end_date:
-            print(f"Skipping folder: {datetime_folder}")
-            continue
+    for partition in results_store.partitions(date_range=datetime_range):
+        datetime_folder, pir_folder, pf_folder = partition['created_date'], partition['engine'], partition['context']
+        df = results_store.read_partition(**partition)
+        print(f"Loaded dataset from {results_store.partition_path(**partition)}")
         
-        pir_path = os.path.join(datasets_file_path, datetime_folder)
-        pir_folders = [folder for folder in os.listdir(pir_path) if os.path.isdir(os.path.join(pir_path, folder))]
-        pir_folders = sorted(pir_folders)
-
-        for pir_folder in pir_folders:
-            pf_path = os.path.join(pir_path, pir_folder)
-            pf_folders = [folder for folder in os.listdir(pf_path) if os.path.isdir(os.path.join(pf_path, folder))]
-            pf_folders = sorted(pf_folders)
-            
-            for pf_folder in pf_folders:
-                final_path = os.path.join(pf_path, pf_folder)
-                csv_files = [file for file in os.listdir(final_path) if file.endswith('.csv') and not file.startswith('finetune_classified_updated_')]
-                csv_files = sorted(csv_files)
-                
-                for file in csv_files:
-                    dataset_file_path = os.path.join(final_path, file)
-                    df = pd.read_csv(dataset_file_path)
-                    print(f"Loaded dataset from {dataset_file_path}")
-                    
-                    file_name = file.replace('finetune_classified_updated_', '').replace('.csv', '')
-                    query = file_name.split('_')[0]
-                    pf = file_name.split('_')[1:]
-                    
-                    print(f"Processing: Date={datetime_folder}, PIR={pir_folder}, PF={pf_folder}, Query={query}, PF Details={pf}")
+        query = partition['topic']
+        pf = partition['variant'].split('_')
+        
+        print(f"Processing: Date={datetime_folder}, PIR={pir_folder}, PF={pf_folder}, Query={query}, PF Details={pf}")
 
-                    # Get columns for each model type with personas
-                    claude_columns = get_model_persona_columns(df, claude_model_version_list)
-                    chatgpt_columns = get_model_persona_columns(df, chatgpt_model_version_list)
+        # Get columns for each model type with personas
+        claude_columns = get_model_persona_columns(df, claude_model_version_list)
+        chatgpt_columns = get_model_persona_columns(df, chatgpt_model_version_list)
                         
-                    columns_to_process = claude_columns + chatgpt_columns
+        columns_to_process = claude_columns + chatgpt_columns
 
-                    for column in columns_to_process:
-                        print(f"Processing column: {column}")
-                        # print(len(df[column]))
-                        # print(df[column])
-                        parsed_data = df[column].apply(parse_response)
+        for column in columns_to_process:
+            print(f"Processing column: {column}")
+            # print(len(df[column]))
+            # print(df[column])
+            parsed_data = df[column].apply(parse_response)
                         
-                        # Add persona information to the parsed data
-                        model_name, persona = column.rsplit('_', 1)
-                        parsed_df = pd.DataFrame(parsed_data.tolist())
+            # Add persona information to the parsed data
+            model_name, persona = column.rsplit('_', 1)
+            parsed_df = pd.DataFrame(parsed_data.tolist())
                         
-                        # Add persona information to column names
-                        parsed_df = parsed_df.add_prefix(f'{column}_')
+            # Add persona information to column names
+            parsed_df = parsed_df.add_prefix(f'{column}_')
                         
-                        # Add persona as a separate column
-                        parsed_df[f'{column}_persona'] = persona
+            # Add persona as a separate column
+            parsed_df[f'{column}_persona'] = persona
                         
-                        # Concatenate with original DataFrame
-                        df = pd.concat([df, parsed_df], axis=1)
-                        # print(f"Processed column: {column}")
-                        # print(df.head())
+            # Concatenate with original DataFrame
+            df = pd.concat([df, parsed_df], axis=1)
+            # print(f"Processed column: {column}")
+            # print(df.head())
                     
-                    # Save the updated DataFrame
-                    result_final_path = final_path.replace('result_folder', 'parsing_folder')
-                    result_file_path = os.path.join(result_final_path, file)
-                    os.makedirs(result_final_path, exist_ok=True)
-                    df.to_csv(result_file_path, index=False)
-                    print(f"Saved updated results to {result_file_path}")
+        # Save the updated DataFrame
+        result_file_path = parsing_store.write(df, **partition)
+        print(f"Saved updated results to {result_file_path}")
 
 def clean_json_string(json_string):
     try:
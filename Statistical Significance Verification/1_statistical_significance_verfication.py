@@ -4,17 +4,28 @@ from scipy.stats import kruskal, f_oneway, shapiro, levene
 from statsmodels.stats.multitest import multipletests
 from statsmodels.stats.multicomp import pairwise_tukeyhsd
 import numpy as np
-from datetime import datetime
 import re
 import traceback
 import math
+import sys
 
-# Set the directory and fetch the dataset files
+# Set the directory and fetch the dataset partitions
 current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(current_dir, '../Context-Aware Concurrent Data Collection'))
+from Collection_Engine.dataset_store import file_name, get_store
+
 # cache_2dim_political_stance_personas
 setting_date = '0921-30'
-datasets_file_path = os.path.join(current_dir, f'../parsing_folder/results_{setting_date}')
-datetime_folders = [folder for folder in os.listdir(datasets_file_path) if os.path.isdir(os.path.join(datasets_file_path, folder))]
+parsing_store = get_store(f'parsed_{setting_date}')
+
+# date -> engine -> context -> partitions, listed from the store's catalog
+folder_partitions = {}
+for partition in parsing_store.partitions():
+    (folder_partitions.setdefault(partition['created_date'], {})
+     .setdefault(partition['engine'], {})
+     .setdefault(partition['context'], [])
+     .append(partition))
+datetime_folders = sorted(folder_partitions)
 
 # Dictionary to store all statistical test results
 pf_model_comparisons = {}
@@ -26,33 +37,29 @@ def calculate_unique_url_counts():
 
     # Process datasets
     for datetime_folder in datetime_folders:
-        folder_date = datetime.strptime(datetime_folder, "%Y-%m-%d")
-        pir_folders = [folder for folder in os.listdir(os.path.join(datasets_file_path, datetime_folder))]
-        pir_path = os.path.join(datasets_file_path, datetime_folder)
+        pir_folders = folder_partitions[datetime_folder]
 
         for pir_folder in pir_folders:
-            pf_folders = [folder for folder in os.listdir(os.path.join(pir_path, pir_folder))]
-            pf_path = os.path.join(datasets_file_path, datetime_folder, pir_folder)
+            pf_folders = pir_folders[pir_folder]
 
             for pf_folder in pf_folders:
-                csv_files = [file for file in os.listdir(os.path.join(pf_path, pf_folder)) if file.endswith('.csv')]
-                csv_files = sorted(csv_files)
-                final_path = os.path.join(pf_path, pf_folder)
+                partitions = pf_folders[pf_folder]
 
-                for file in csv_files:
+                for partition in partitions:
                     try:
-                        df = pd.read_csv(os.path.join(final_path, file), encoding='utf-8')[:30]
+                        # Only the url column is decoded
+                        df = parsing_store.read_partition(columns=['url'], **partition)[:30]
                         
                         # Add metadata columns
-                        df['query'] = file.split('_')[0].lower()
-                        df['pf_folder_Details'] = '_'.join(file.replace('.csv', '').split('_')[1:])
+                        df['query'] = partition['topic'].lower()
+                        df['pf_folder_Details'] = partition['variant']
                         df['datetime_folder'] = datetime_folder
                         df['pir_folder'] = pir_folder
                         df['pf_folder'] = pf_folder
                         
                         all_dfs.append(df)
                     except Exception as e:
-                        print(f"Error reading file {file}: {e}")
+                        print(f"Error reading partition {datetime_folder}/{pir_folder}/{pf_folder}/{file_name(partition['topic'], partition['variant'])}: {e}")
                         continue
 
     # Combine all dataframes
@@ -313,32 +320,26 @@ def ensure_numeric(scores_list):
     return cleaned_scores
 
 for datetime_folder in datetime_folders:
-    folder_date = datetime.strptime(datetime_folder, "%Y-%m-%d")
-    pir_folders = [folder for folder in os.listdir(os.path.join(datasets_file_path, datetime_folder))]
-    pir_path = os.path.join(datasets_file_path, datetime_folder)
+    pir_folders = folder_partitions[datetime_folder]
 
     for pir_folder in pir_folders:
-        pf_folders = [folder for folder in os.listdir(os.path.join(pir_path, pir_folder))]
-        pf_path = os.path.join(datasets_file_path, datetime_folder, pir_folder)
+        pf_folders = pir_folders[pir_folder]
 
         for pf_folder in pf_folders:
-            csv_files = [file for file in os.listdir(os.path.join(pf_path, pf_folder)) if file.endswith('.csv')]
-            csv_files = sorted(csv_files)
-            final_path = os.path.join(pf_path, pf_folder)
+            partitions = pf_folders[pf_folder]
 
             model_scores = {model_name: {} for model_name in ['Political_Score', 'Stance_Score', 'Subjectivity_Score', 'Bias_Score']}
 
-            for file in csv_files:
+            for partition in partitions:
                 try:
-                    df = pd.read_csv(os.path.join(final_path, file), encoding='utf-8')[:30]
+                    df = parsing_store.read_partition(**partition)[:30]
                 except:
                     continue  # Handling file read errors
 
-                file_name = file.replace('.csv', '')
-                query = file_name.split('_')[0]
+                query = partition['topic']
                 # 쿼리문 소문자로 통일  
                 query = query.lower()
-                pf = tuple(file_name.split('_')[1:])
+                pf = tuple(partition['variant'].split('_'))
 
                 for model_name in model_scores:
                     pattern = re.compile(f'{model_name}$', re.IGNORECASE)